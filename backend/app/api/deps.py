@@ -61,4 +61,13 @@ def get_master_admin_user(current_user: User = Depends(get_current_active_user))
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
+    return current_user
+
+def get_partner_user(current_user: User = Depends(get_current_active_user)) -> User:
+    """Get current partner or admin user."""
+    if current_user.role not in [UserRole.PARTNER, UserRole.ADMIN, UserRole.MASTER_ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
     return current_user
\ No newline at end of file
@@ -0,0 +1,77 @@
+import os
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_admin_user
+from app.core.admission import admission_controller
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.jobs import metrics as job_metrics
+from app.core.profiling import profile_path
+from app.crud.crud_job import get_job_counts
+from app.crud.crud_stats import (
+    get_order_status_counts, get_daily_order_counts, get_plot_status_by_region,
+    get_completed_revenue, get_top_councils
+)
+from app.db.session import get_db
+from app.schemas.admin import AdminStats, JobStats, AdmissionStats
+from app.db.models import User as UserModel
+
+router = APIRouter()
+
+stats_cache = TTLCache(ttl_seconds=settings.ADMIN_STATS_CACHE_TTL, max_entries=64)
+
+@router.get("/stats", response_model=AdminStats)
+async def read_admin_stats(
+    days: int = Query(30, ge=1, le=365),
+    top: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_admin_user)
+):
+    """Get order funnel, plot inventory and revenue aggregates (admin only)."""
+    cache_key = (days, top)
+    stats = stats_cache.get(cache_key)
+    if stats is None:
+        stats = AdminStats(
+            generated_at=datetime.now(timezone.utc),
+            orders_by_status=get_order_status_counts(db),
+            daily_orders=get_daily_order_counts(db, days=days),
+            plots_by_region=get_plot_status_by_region(db),
+            revenue=get_completed_revenue(db),
+            top_councils=get_top_councils(db, limit=top)
+        )
+        stats_cache.set(cache_key, stats)
+    return stats
+
+
+@router.get("/jobs", response_model=JobStats)
+async def read_job_stats(
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_admin_user)
+):
+    """Get background job queue depth and this process's worker metrics (admin only)."""
+    return JobStats(queue=get_job_counts(db), **job_metrics.snapshot())
+
+
+@router.get("/admission", response_model=AdmissionStats)
+async def read_admission_stats(
+    current_user: UserModel = Depends(get_admin_user)
+):
+    """Get this process's in-flight requests, queue depth and shed counts per route class (admin only)."""
+    return admission_controller.snapshot()
+
+@router.get("/profiles/{profile_id}")
+async def read_profile(
+    profile_id: str,
+    current_user: UserModel = Depends(get_admin_user)
+):
+    """Download a request profile in speedscope format (admin only)."""
+    path = profile_path(profile_id)
+    if path is None or not os.path.isfile(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return FileResponse(path, media_type="application/json", filename=os.path.basename(path))
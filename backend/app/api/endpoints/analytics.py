@@ -0,0 +1,72 @@
+import logging
+import time
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.events import PlotChange, on_plot_change
+from app.core.scheduler import schedule_periodic
+from app.crud.crud_analytics import get_price_stats, refresh_price_stats
+from app.db.session import BackgroundSessionLocal, get_db
+from app.schemas.analytics import PriceStats
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+PRICE_FIELDS = ("price", "area_sqm", "usage_type", "council_id")
+
+_price_stats_state = {"dirty": True, "refreshed_at": 0.0}
+
+@on_plot_change
+def _mark_price_stats_dirty(change: PlotChange) -> None:
+    before, after = change.before or {}, change.after or {}
+    if any(before.get(field) != after.get(field) for field in PRICE_FIELDS):
+        _price_stats_state["dirty"] = True
+
+def _refresh_price_stats_if_stale() -> None:
+    age = time.monotonic() - _price_stats_state["refreshed_at"]
+    if not _price_stats_state["dirty"] and age < settings.PRICE_STATS_MAX_AGE_SECONDS:
+        return
+    
+    # Clear first so writes that land during the refresh trigger another one.
+    _price_stats_state["dirty"] = False
+    db = BackgroundSessionLocal()
+    try:
+        if refresh_price_stats(db):
+            logger.info("Refreshed plot_price_stats")
+        _price_stats_state["refreshed_at"] = time.monotonic()
+    except Exception:
+        _price_stats_state["dirty"] = True
+        raise
+    finally:
+        db.close()
+
+schedule_periodic("refresh-price-stats", settings.PRICE_STATS_REFRESH_SECONDS, _refresh_price_stats_if_stale)
+
+@router.get("/price-per-sqm", response_model=List[PriceStats])
+async def read_price_stats(
+    level: str = Query("region", pattern="^(region|district|council)$"),
+    region_id: Optional[int] = Query(None),
+    district_id: Optional[int] = Query(None),
+    council_id: Optional[int] = Query(None),
+    usage_type: Optional[str] = Query(None),
+    by_usage: bool = Query(False),
+    db: Session = Depends(get_db)
+):
+    """Get median and quartile price per sqm by area and usage type.
+
+    Passing a council, district or region id selects that area; otherwise
+    every area at ``level`` is returned. Figures span all usage types unless
+    ``usage_type`` is given or ``by_usage`` asks for one row per usage type.
+    """
+    area_id = None
+    if council_id:
+        level, area_id = "council", council_id
+    elif district_id:
+        level, area_id = "district", district_id
+    elif region_id:
+        level, area_id = "region", region_id
+    
+    return get_price_stats(db, level, area_id=area_id, usage_type=usage_type, by_usage=by_usage)
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Set
+from fastapi import APIRouter, Response
+
+from app.core.config import settings
+from app.core.events import PlotChange, on_plot_change
+from app.core.feeds import FEATURED_PREFIX, FeedStore, LATEST, featured_feed, serialize_plot, serialize_snapshot
+from app.core.scheduler import schedule_periodic
+from app.crud.crud_plot import get_latest_plots, get_featured_plots
+from app.db.session import BackgroundSessionLocal
+from app.schemas.plot import Plot
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+feed_store = FeedStore(size=settings.FEED_SIZE)
+
+_feed_state = {"rebuilt_at": 0.0}
+
+def _query_feeds(db, names: Optional[Set[str]] = None) -> Dict[str, list]:
+    """(created_at, plot_id, body) rows for the named feeds, or for every feed."""
+    feeds = {}
+    if names is None or LATEST in names:
+        feeds[LATEST] = [
+            (plot.created_at, str(plot.id), serialize_plot(plot))
+            for plot in get_latest_plots(db, feed_store.keep)
+        ]
+    
+    region_ids = None
+    if names is not None:
+        region_ids = [int(name[len(FEATURED_PREFIX):]) for name in names if name.startswith(FEATURED_PREFIX)]
+        if not region_ids:
+            return feeds
+        # Regions left with no featured plots are emptied too.
+        feeds.update({featured_feed(region_id): [] for region_id in region_ids})
+    for plot, region_id in get_featured_plots(db, feed_store.keep, region_ids):
+        feeds.setdefault(featured_feed(region_id), []).append(
+            (plot.created_at, str(plot.id), serialize_plot(plot))
+        )
+    return feeds
+
+def rebuild_feeds() -> None:
+    """Rebuild every feed from the database."""
+    db = BackgroundSessionLocal()
+    try:
+        with feed_store.reading() as since:
+            feed_store.load(_query_feeds(db), since)
+        _feed_state["rebuilt_at"] = time.monotonic()
+    finally:
+        db.close()
+
+def refill_feeds(names: Set[str]) -> None:
+    """Reload only the named feeds from the database."""
+    db = BackgroundSessionLocal()
+    try:
+        with feed_store.reading() as since:
+            feed_store.refill(_query_feeds(db, names), since)
+    finally:
+        db.close()
+
+def _refresh_feeds() -> None:
+    # Refill feeds that ran short, and periodically reconcile everything with
+    # writes made by other processes.
+    age = time.monotonic() - _feed_state["rebuilt_at"]
+    if not feed_store.ready or age >= settings.FEED_RECONCILE_SECONDS:
+        rebuild_feeds()
+    elif feed_store.dirty:
+        refill_feeds(feed_store.dirty_feeds())
+
+schedule_periodic("refresh-feeds", settings.FEED_REFILL_SECONDS, _refresh_feeds, run_at_startup=True)
+
+@on_plot_change
+def _update_feeds(change: PlotChange) -> None:
+    after = change.after
+    if after is not None and feed_store.wants(after):
+        feed_store.apply(change.plot_id, after, serialize_snapshot(after))
+    else:
+        feed_store.apply(change.plot_id, None)
+
+_build_lock = asyncio.Lock()
+
+async def _ensure_feeds() -> None:
+    if feed_store.ready:
+        return
+    async with _build_lock:
+        if not feed_store.ready:
+            await asyncio.to_thread(rebuild_feeds)
+
+@router.get("/latest", response_model=List[Plot])
+async def read_latest_feed():
+    """Get the newest available plots."""
+    await _ensure_feeds()
+    return Response(content=feed_store.payload(LATEST), media_type="application/json")
+
+@router.get("/featured", response_model=Dict[int, List[Plot]])
+async def read_featured_feeds():
+    """Get the newest available plots with images for every region, keyed by region id."""
+    await _ensure_feeds()
+    return Response(content=feed_store.featured_payload(), media_type="application/json")
+
+@router.get("/featured/{region_id}", response_model=List[Plot])
+async def read_featured_feed(region_id: int):
+    """Get the newest available plots with images in a region."""
+    await _ensure_feeds()
+    return Response(content=feed_store.payload(featured_feed(region_id)), media_type="application/json")
@@ -1,12 +1,20 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_active_user, get_admin_user
-from app.crud.crud_order import get_orders, get_order, create_order, update_order
+from app.core.batch import parse_batch_ids, order_batch
+from app.core.export import export_response
+from app.core.idempotency import IdempotentRequest
+from app.core.jobs import enqueue
+from app.core.notifications import ORDER_CREATED, ORDER_STATUS_CHANGED
+from app.crud.crud_order import (
+    get_orders, get_order, create_order, update_order, iter_order_export_rows, get_orders_by_ids
+)
 from app.crud.crud_plot import get_plot, update_plot_status
 from app.db.session import get_db
-from app.schemas.order import Order, OrderCreate, OrderUpdate, OrderWithDetails
+from app.schemas.order import Order, OrderCreate, OrderUpdate, OrderWithDetails, OrderBatch
 from app.db.models import User as UserModel, PlotStatus
 
 router = APIRouter()
@@ -24,6 +32,42 @@ async def read_orders(
     else:
         return get_orders(db, user_id=current_user.id, skip=skip, limit=limit)
 
+@router.get("/batch", response_model=OrderBatch)
+async def read_orders_batch(
+    ids: str = Query(..., description="Comma-separated order IDs"),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """Get several orders by ID in request order. Orders the user may not see are reported as missing."""
+    requested, order_ids = parse_batch_ids(ids)
+    user_id = None if current_user.role in ["admin", "master_admin"] else current_user.id
+    items, missing = order_batch(requested, get_orders_by_ids(db, order_ids, user_id=user_id))
+    return {"items": items, "missing": missing}
+
+ORDER_EXPORT_COLUMNS = [
+    "id", "order_status", "created_at", "user_id", "user_email",
+    "plot_id", "plot_number", "plot_title", "plot_price"
+]
+
+@router.get("/export")
+async def export_orders(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    gzip: bool = Query(False),
+    order_status: Optional[str] = Query(None),
+    created_from: Optional[datetime] = Query(None),
+    created_to: Optional[datetime] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_admin_user)
+):
+    """Stream all orders matching the filters (admin only)."""
+    rows = iter_order_export_rows(
+        db,
+        order_status=order_status,
+        created_from=created_from,
+        created_to=created_to
+    )
+    return export_response(rows, format, ORDER_EXPORT_COLUMNS, "orders", gzip=gzip)
+
 @router.get("/{order_id}", response_model=OrderWithDetails)
 async def read_order(
     order_id: str,
@@ -50,29 +94,38 @@ async def read_order(
 @router.post("/", response_model=Order)
 async def create_new_order(
     order_data: OrderCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
 ):
-    """Create new order."""
-    # Check if plot exists and is available
-    plot = get_plot(db, order_data.plot_id)
-    if not plot:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Plot not found"
-        )
-    
-    if plot.status != PlotStatus.AVAILABLE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Plot is not available for purchase"
-        )
-    
-    # Create order and update plot status
-    order = create_order(db, order_data, current_user.id)
-    update_plot_status(db, order_data.plot_id, PlotStatus.PENDING_PAYMENT)
-    
-    return order
+    """Create new order. Retries with the same Idempotency-Key return the original order."""
+    scope = f"POST /api/orders/:{current_user.id}"
+    async with IdempotentRequest(db, idempotency_key, scope, order_data) as idempotent:
+        if idempotent.replay is not None:
+            return idempotent.replay
+        
+        # Check if plot exists and is available
+        plot = get_plot(db, order_data.plot_id)
+        if not plot:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Plot not found"
+            )
+        
+        if plot.status != PlotStatus.AVAILABLE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Plot is not available for purchase"
+            )
+        
+        # Create order, update plot status and queue its side effects in one
+        # transaction; notifications and the like run in the job workers.
+        order = create_order(db, order_data, current_user.id, commit=False)
+        update_plot_status(db, order_data.plot_id, PlotStatus.PENDING_PAYMENT, commit=False)
+        enqueue(db, ORDER_CREATED, {"order_id": str(order.id)}, commit=False)
+        
+        # Commits the order together with the stored Idempotency-Key response
+        return idempotent.complete(Order.model_validate(order))
 
 @router.put("/{order_id}", response_model=Order)
 async def update_existing_order(
@@ -89,10 +142,22 @@ async def update_existing_order(
             detail="Order not found"
         )
     
-    # Update plot status based on order status
+    previous_status = order.order_status
+    
+    # Update plot status based on order status, in the same transaction as the order
     if order_update.order_status == "completed":
-        update_plot_status(db, order.plot_id, PlotStatus.SOLD)
+        update_plot_status(db, order.plot_id, PlotStatus.SOLD, commit=False)
     elif order_update.order_status == "cancelled":
-        update_plot_status(db, order.plot_id, PlotStatus.AVAILABLE)
+        update_plot_status(db, order.plot_id, PlotStatus.AVAILABLE, commit=False)
+    
+    order = update_order(db, order_id, order_update, commit=False)
+    if order.order_status != previous_status:
+        enqueue(db, ORDER_STATUS_CHANGED, {
+            "order_id": str(order.id),
+            "previous_status": previous_status,
+            "order_status": order.order_status,
+        }, commit=False)
+    db.commit()
+    db.refresh(order)
     
-    return update_order(db, order_id, order_update)
\ No newline at end of file
+    return order
\ No newline at end of file
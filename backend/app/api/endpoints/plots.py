@@ -1,25 +1,63 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import math
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 from decimal import Decimal
 
-from app.api.deps import get_current_active_user, get_admin_user
+from app.api.deps import get_current_active_user, get_admin_user, get_partner_user
+from app.core.batch import parse_batch_ids, order_batch
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.events import PlotChange, on_plot_change
+from app.core.export import export_response
+from app.core.geometry import GeometryError, PlotOverlapError
+from app.core.idempotency import IdempotentRequest
+from app.core.map_payload import ENCODERS, MAP_FORMATS, MEDIA_TYPES
 from app.crud.crud_plot import (
     get_plots, get_plot, create_plot, update_plot, delete_plot,
-    search_plots
+    search_plots, iter_plot_export_rows, get_similar_plots, plot_snapshot, PLOT_SORTS,
+    get_plot_clusters, get_plots_by_ids, get_plot_points
 )
 from app.crud.crud_location import get_regions, get_districts, get_councils
 from app.db.session import get_db
-from app.schemas.plot import Plot, PlotCreate, PlotUpdate, PlotSearch
+from app.schemas.plot import (
+    Plot, PlotCreate, PlotUpdate, PlotSearch, SimilarPlot, PlotClusters, PlotBatch
+)
 from app.schemas.location import Region, District, Council
 from app.db.models import User as UserModel, PlotStatus
 
 router = APIRouter()
 
+# Similar-plot results keyed by (plot_id, k, rerank). Each entry remembers the
+# target's bounds and search radius so writes only evict results they can affect.
+similar_plots_cache = TTLCache(ttl_seconds=settings.SIMILAR_PLOTS_CACHE_TTL, max_entries=4096)
+
+METRES_PER_DEGREE = 111_320
+
+def _bounds_distance(a, b) -> float:
+    """Distance in degrees between two (minx, miny, maxx, maxy) boxes."""
+    dx = max(a[0] - b[2], b[0] - a[2], 0.0)
+    dy = max(a[1] - b[3], b[1] - a[3], 0.0)
+    return math.hypot(dx, dy)
+
+@on_plot_change
+def _invalidate_similar_plots(change: PlotChange) -> None:
+    bounds = [snapshot["bounds"] for snapshot in (change.before, change.after) if snapshot and snapshot["bounds"]]
+    
+    def affected(key, entry) -> bool:
+        if key[0] == change.plot_id or change.plot_id in entry["ids"]:
+            return True
+        if entry["target_bounds"] is None:
+            return False
+        return any(_bounds_distance(entry["target_bounds"], b) <= entry["radius_deg"] for b in bounds)
+    
+    similar_plots_cache.invalidate(affected)
+
 @router.get("/", response_model=List[Plot])
 async def read_plots(
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=settings.MAP_MAX_POINTS),
     search: Optional[str] = Query(None),
     min_price: Optional[Decimal] = Query(None),
     max_price: Optional[Decimal] = Query(None),
@@ -30,9 +68,15 @@ async def read_plots(
     council_id: Optional[int] = Query(None),
     usage_type: Optional[str] = Query(None),
     status: Optional[PlotStatus] = Query(PlotStatus.AVAILABLE),
+    sort: str = Query("newest", pattern=f"^({'|'.join(PLOT_SORTS)})$"),
+    format: str = Query("json", pattern=f"^(json|{'|'.join(MAP_FORMATS)})$"),
     db: Session = Depends(get_db)
 ):
-    """Get plots with optional filtering."""
+    """Get plots with optional filtering and sorting.
+
+    ``format=columns`` or ``format=packed`` returns only id, centroid, price
+    and status per plot, as JSON column arrays or packed binary arrays.
+    """
     search_params = PlotSearch(
         search=search,
         min_price=min_price,
@@ -43,11 +87,171 @@ async def read_plots(
         district_id=district_id,
         council_id=council_id,
         usage_type=usage_type,
-        status=status
+        status=status,
+        sort=sort
     )
     
+    if format in MAP_FORMATS:
+        points = get_plot_points(db, search_params, skip=skip, limit=limit)
+        return Response(content=ENCODERS[format](points), media_type=MEDIA_TYPES[format])
     return search_plots(db, search_params, skip=skip, limit=limit)
 
+PLOT_EXPORT_COLUMNS = [
+    "id", "plot_number", "title", "area_sqm", "price", "usage_type", "status",
+    "council_id", "council", "district", "region", "uploaded_by_id", "created_at"
+]
+
+@router.get("/batch", response_model=PlotBatch)
+async def read_plots_batch(
+    ids: str = Query(..., description="Comma-separated plot IDs"),
+    db: Session = Depends(get_db)
+):
+    """Get several plots by ID in request order, listing IDs that were not found."""
+    requested, plot_ids = parse_batch_ids(ids)
+    items, missing = order_batch(requested, get_plots_by_ids(db, plot_ids))
+    return {"items": items, "missing": missing}
+
+# Clusters are computed per lon/lat tile of 360 / 2**zoom degrees, each split
+# into CLUSTER_GRID x CLUSTER_GRID cells, and cached per (zoom, x, y, status).
+CLUSTER_GRID = 8
+MAX_CLUSTER_ZOOM = 18
+
+cluster_cache = TTLCache(ttl_seconds=settings.CLUSTER_CACHE_TTL, max_entries=20000)
+
+def _tile_size(zoom: int) -> float:
+    return 360.0 / (2 ** zoom)
+
+def _tile_index(lon: float, lat: float, zoom: int) -> Tuple[int, int]:
+    size = _tile_size(zoom)
+    return math.floor((lon + 180) / size), math.floor((lat + 90) / size)
+
+@on_plot_change
+def _invalidate_plot_clusters(change: PlotChange) -> None:
+    for snapshot in (change.before, change.after):
+        if not snapshot or not snapshot["centroid"]:
+            continue
+        lon, lat = snapshot["centroid"]
+        for zoom in range(MAX_CLUSTER_ZOOM + 1):
+            x, y = _tile_index(lon, lat, zoom)
+            for cluster_status in [None, *PlotStatus]:
+                cluster_cache.delete((zoom, x, y, cluster_status))
+
+@router.get("/clusters", response_model=PlotClusters)
+async def read_plot_clusters(
+    bbox: str = Query(..., description="min_lon,min_lat,max_lon,max_lat"),
+    zoom: int = Query(..., ge=0, le=MAX_CLUSTER_ZOOM),
+    cluster_status: Optional[PlotStatus] = Query(None, alias="status"),
+    db: Session = Depends(get_db)
+):
+    """Get grid clusters of plots for a map viewport."""
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(value) for value in bbox.split(","))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="bbox must be min_lon,min_lat,max_lon,max_lat"
+        )
+    if min_lon >= max_lon or min_lat >= max_lat:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="bbox minimums must be below maximums"
+        )
+    
+    size = _tile_size(zoom)
+    min_x, min_y = _tile_index(max(min_lon, -180), max(min_lat, -90), zoom)
+    max_x, max_y = _tile_index(min(max_lon, 180) - 1e-9, min(max_lat, 90) - 1e-9, zoom)
+    if (max_x - min_x + 1) * (max_y - min_y + 1) > settings.CLUSTER_MAX_TILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Viewport covers too many tiles for this zoom"
+        )
+    
+    clusters = []
+    for x in range(min_x, max_x + 1):
+        for y in range(min_y, max_y + 1):
+            cache_key = (zoom, x, y, cluster_status)
+            tile = cluster_cache.get(cache_key)
+            if tile is None:
+                tile_bounds = (x * size - 180, y * size - 90, (x + 1) * size - 180, (y + 1) * size - 90)
+                tile = get_plot_clusters(db, tile_bounds, size / CLUSTER_GRID, status=cluster_status)
+                cluster_cache.set(cache_key, tile)
+            clusters.extend(tile)
+    
+    return {"zoom": zoom, "clusters": clusters}
+
+@router.get("/export")
+async def export_plots(
+    format: str = Query("ndjson", pattern="^(ndjson|csv|geojson)$"),
+    gzip: bool = Query(False),
+    search: Optional[str] = Query(None),
+    min_price: Optional[Decimal] = Query(None),
+    max_price: Optional[Decimal] = Query(None),
+    min_area: Optional[Decimal] = Query(None),
+    max_area: Optional[Decimal] = Query(None),
+    region_id: Optional[int] = Query(None),
+    district_id: Optional[int] = Query(None),
+    council_id: Optional[int] = Query(None),
+    usage_type: Optional[str] = Query(None),
+    status: Optional[PlotStatus] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_partner_user)
+):
+    """Stream all plots matching the filters (partners and admins)."""
+    search_params = PlotSearch(
+        search=search,
+        min_price=min_price,
+        max_price=max_price,
+        min_area=min_area,
+        max_area=max_area,
+        region_id=region_id,
+        district_id=district_id,
+        council_id=council_id,
+        usage_type=usage_type,
+        status=status
+    )
+    rows = iter_plot_export_rows(db, search_params, with_geometry=(format == "geojson"))
+    return export_response(rows, format, PLOT_EXPORT_COLUMNS, "plots", gzip=gzip)
+
+@router.get("/{plot_id}/similar", response_model=List[SimilarPlot])
+async def read_similar_plots(
+    plot_id: str,
+    k: int = Query(10, ge=1, le=settings.SIMILAR_PLOTS_MAX_K),
+    rerank: bool = Query(False),
+    db: Session = Depends(get_db)
+):
+    """Get the nearest available plots, optionally re-ranked by price and area similarity."""
+    cache_key = (plot_id, k, rerank)
+    cached = similar_plots_cache.get(cache_key)
+    if cached is not None:
+        return cached["items"]
+    
+    plot = get_plot(db, plot_id)
+    if not plot:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Plot not found"
+        )
+    
+    results, radius_m = get_similar_plots(db, plot, k=k, rerank=rerank)
+    items = [
+        SimilarPlot.model_validate(candidate).model_copy(update={"distance_m": distance})
+        for candidate, distance in results
+    ]
+    
+    target = plot_snapshot(plot)
+    radius_deg = math.inf
+    if target["centroid"] and not math.isinf(radius_m):
+        # Divide by the shortest degree (longitude) at this latitude so the radius never undershoots.
+        lat = math.radians(target["centroid"][1])
+        radius_deg = radius_m / (METRES_PER_DEGREE * max(math.cos(lat), 0.01))
+    similar_plots_cache.set(cache_key, {
+        "items": items,
+        "ids": {str(item.id) for item in items},
+        "target_bounds": target["bounds"],
+        "radius_deg": radius_deg,
+    })
+    return items
+
 @router.get("/{plot_id}", response_model=Plot)
 async def read_plot(
     plot_id: str,
@@ -65,11 +269,30 @@ async def read_plot(
 @router.post("/", response_model=Plot)
 async def create_new_plot(
     plot_data: PlotCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_admin_user)
 ):
-    """Create new plot (admin only)."""
-    return create_plot(db, plot_data, current_user.id)
+    """Create new plot (admin only). Retries with the same Idempotency-Key return the original plot."""
+    scope = f"POST /api/plots/:{current_user.id}"
+    async with IdempotentRequest(db, idempotency_key, scope, plot_data) as idempotent:
+        if idempotent.replay is not None:
+            return idempotent.replay
+        
+        try:
+            plot = create_plot(db, plot_data, current_user.id, commit=False)
+        except GeometryError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(exc)
+            )
+        except PlotOverlapError as exc:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=str(exc)
+            )
+        return idempotent.complete(Plot.model_validate(plot))
 
 @router.put("/{plot_id}", response_model=Plot)
 async def update_existing_plot(
@@ -85,7 +308,20 @@ async def update_existing_plot(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Plot not found"
         )
-    return update_plot(db, plot_id, plot_update)
+    try:
+        return update_plot(db, plot_id, plot_update)
+    except GeometryError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(exc)
+        )
+    except PlotOverlapError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(exc)
+        )
 
 @router.delete("/{plot_id}")
 async def delete_existing_plot(
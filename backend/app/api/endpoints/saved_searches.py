@@ -0,0 +1,98 @@
+import logging
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_active_user
+from app.core.config import settings
+from app.core.events import PlotChange, on_plot_write
+from app.core.jobs import enqueue
+from app.core.notifications import SAVED_SEARCH_MATCHED
+from app.core.saved_searches import became_available, saved_search_index
+from app.core.scheduler import schedule_periodic
+from app.crud.crud_saved_search import (
+    get_saved_search, get_saved_searches, create_saved_search, delete_saved_search, iter_notifying_searches
+)
+from app.db.session import BackgroundSessionLocal, get_db
+from app.schemas.plot import PlotSearch
+from app.schemas.saved_search import SavedSearch, SavedSearchCreate
+from app.db.models import User as UserModel
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+def reload_saved_search_index() -> None:
+    """Rebuild the matching index from the saved_searches table."""
+    db = BackgroundSessionLocal()
+    try:
+        saved_search_index.load(
+            (search_id, user_id, PlotSearch(**criteria))
+            for search_id, user_id, criteria in iter_notifying_searches(db)
+        )
+        logger.info("Saved search index built with %s searches", len(saved_search_index))
+    finally:
+        db.close()
+
+# Periodic reloads pick up searches saved or deleted through other processes.
+schedule_periodic(
+    "reload-saved-search-index", settings.SAVED_SEARCH_RELOAD_SECONDS, reload_saved_search_index, run_at_startup=True
+)
+
+@on_plot_write
+def _match_saved_searches(db: Session, change: PlotChange) -> None:
+    # The job is queued in the plot write's own transaction.
+    if not became_available(change.before, change.after):
+        return
+    matches = saved_search_index.match(change.after)
+    if not matches:
+        return
+    
+    enqueue(db, SAVED_SEARCH_MATCHED, {
+        "plot_id": change.plot_id,
+        "saved_search_ids": [search_id for search_id, _ in matches],
+    }, commit=False)
+
+@router.get("/", response_model=List[SavedSearch])
+async def read_saved_searches(
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """Get the current user's saved searches."""
+    return get_saved_searches(db, current_user.id)
+
+@router.post("/", response_model=SavedSearch)
+async def create_new_saved_search(
+    saved_search: SavedSearchCreate,
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """Save a plot search and be notified when new plots match it."""
+    if len(get_saved_searches(db, current_user.id)) >= settings.MAX_SAVED_SEARCHES_PER_USER:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.MAX_SAVED_SEARCHES_PER_USER} saved searches are allowed"
+        )
+    
+    db_search = create_saved_search(db, saved_search, current_user.id)
+    if db_search.notify:
+        saved_search_index.add(str(db_search.id), str(current_user.id), saved_search.criteria)
+    return db_search
+
+@router.delete("/{search_id}")
+async def delete_existing_saved_search(
+    search_id: str,
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """Delete one of the current user's saved searches."""
+    db_search = get_saved_search(db, search_id)
+    if not db_search or db_search.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Saved search not found"
+        )
+    
+    delete_saved_search(db, search_id)
+    saved_search_index.remove(str(db_search.id))
+    return {"message": "Saved search deleted successfully"}
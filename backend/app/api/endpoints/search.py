@@ -0,0 +1,67 @@
+import asyncio
+import logging
+from typing import List
+from fastapi import APIRouter, Query
+
+from app.core.events import PlotChange, on_plot_change
+from app.core.scheduler import schedule_periodic
+from app.core.suggest import Suggestion as SuggestEntry, suggest_index
+from app.crud.crud_location import iter_location_names
+from app.crud.crud_plot import iter_plot_numbers
+from app.db.session import BackgroundSessionLocal
+from app.schemas.search import Suggestion
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Full rebuilds pick up location changes and plot writes made by other processes.
+SUGGEST_REBUILD_SECONDS = 6 * 3600
+
+def rebuild_suggest_index() -> None:
+    """Rebuild the suggestion index from the location tables and plot numbers."""
+    db = BackgroundSessionLocal()
+    try:
+        suggest_index.locations.load(
+            SuggestEntry(kind, str(location_id), name, parent)
+            for kind, location_id, name, parent in iter_location_names(db)
+        )
+        suggest_index.plots.load(
+            SuggestEntry("plot", plot_id, plot_number, title)
+            for plot_id, plot_number, title in iter_plot_numbers(db)
+        )
+        suggest_index.ready = True
+        logger.info(
+            "Suggest index built with %s locations and %s plots",
+            len(suggest_index.locations), len(suggest_index.plots)
+        )
+    finally:
+        db.close()
+
+schedule_periodic("rebuild-suggest-index", SUGGEST_REBUILD_SECONDS, rebuild_suggest_index, run_at_startup=True)
+
+@on_plot_change
+def _update_suggest_index(change: PlotChange) -> None:
+    after = change.after or {}
+    before = change.before or {}
+    if after.get("plot_number") != before.get("plot_number") or after.get("title") != before.get("title"):
+        suggest_index.set_plot(change.plot_id, after.get("plot_number"), after.get("title"))
+
+# Only one request builds a missing index; the others wait for it.
+_build_lock = asyncio.Lock()
+
+async def _ensure_suggest_index() -> None:
+    if suggest_index.ready:
+        return
+    async with _build_lock:
+        if not suggest_index.ready:
+            await asyncio.to_thread(rebuild_suggest_index)
+
+@router.get("/suggest", response_model=List[Suggestion])
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """Suggest regions, districts, councils and plot numbers starting with q."""
+    await _ensure_suggest_index()
+    return suggest_index.search(q, limit)
@@ -1,12 +1,13 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_active_user, get_master_admin_user
-from app.crud.crud_user import get_users, get_user, update_user
+from app.core.export import export_response
+from app.crud.crud_user import get_users, get_user, update_user, iter_user_export_rows
 from app.db.session import get_db
 from app.schemas.user import User, UserUpdate
-from app.db.models import User as UserModel
+from app.db.models import User as UserModel, UserRole
 
 router = APIRouter()
 
@@ -36,6 +37,22 @@ async def read_users(
     """Get all users (master admin only)."""
     return get_users(db, skip=skip, limit=limit)
 
+USER_EXPORT_COLUMNS = [
+    "id", "first_name", "last_name", "email", "phone_number", "role", "is_active", "created_at"
+]
+
+@router.get("/export")
+async def export_users(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    gzip: bool = Query(False),
+    role: Optional[UserRole] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_master_admin_user)
+):
+    """Stream all users (master admin only)."""
+    rows = iter_user_export_rows(db, role=role)
+    return export_response(rows, format, USER_EXPORT_COLUMNS, "users", gzip=gzip)
+
 @router.get("/{user_id}", response_model=User)
 async def read_user(
     user_id: str,
@@ -0,0 +1,202 @@
+import asyncio
+import json
+import math
+from bisect import insort
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Dict, List
+
+from app.core.config import settings
+from app.core.security import bearer_claims
+
+@dataclass(frozen=True)
+class RouteClass:
+    name: str
+    # Lower priorities are admitted first when requests are queued.
+    priority: int
+    # Share of the total capacity this class may hold at once.
+    share: float
+    max_queue: int
+    max_wait_seconds: float
+
+AUTH = RouteClass("auth", priority=0, share=0.5, max_queue=50, max_wait_seconds=5.0)
+ORDER_CREATE = RouteClass("order_create", priority=0, share=0.5, max_queue=50, max_wait_seconds=5.0)
+WRITE = RouteClass("write", priority=1, share=0.5, max_queue=50, max_wait_seconds=5.0)
+READ = RouteClass("read", priority=2, share=0.8, max_queue=100, max_wait_seconds=2.0)
+BROWSE = RouteClass("browse", priority=3, share=0.6, max_queue=100, max_wait_seconds=1.0)
+
+ROUTE_CLASSES = (AUTH, ORDER_CREATE, WRITE, READ, BROWSE)
+
+# Paths that never touch the database are not admission-controlled.
+UNCONTROLLED_PREFIXES = ("/docs", "/redoc", "/openapi.json", "/health")
+
+def classify(method: str, path: str, authenticated: bool) -> RouteClass:
+    """Route class for a request."""
+    if path.startswith("/api/auth/"):
+        return AUTH
+    if method == "POST" and path.rstrip("/") == "/api/orders":
+        return ORDER_CREATE
+    if method not in ("GET", "HEAD", "OPTIONS"):
+        return WRITE
+    if not authenticated and path.startswith("/api/plots"):
+        return BROWSE
+    return READ
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    route_class: RouteClass = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+class AdmissionController:
+    """Bounded in-flight requests with per-class limits and a priority queue.
+
+    A request is admitted while total in-flight requests are under
+    ``capacity`` and its class is under its share. Otherwise it waits in a
+    queue ordered by class priority, then arrival, until a slot frees or its
+    class's wait deadline passes. When a class's queue is full, requests are
+    shed immediately.
+    """
+
+    def __init__(self, capacity: int, route_classes=ROUTE_CLASSES):
+        self.capacity = capacity
+        self.route_classes = {route_class.name: route_class for route_class in route_classes}
+        self.limits = {
+            route_class.name: max(1, math.floor(capacity * route_class.share))
+            for route_class in route_classes
+        }
+        self.in_flight = 0
+        self.class_in_flight: Counter = Counter()
+        self.queued: Counter = Counter()
+        self.counters: Dict[str, Counter] = {name: Counter() for name in self.route_classes}
+        self._waiters: List[_Waiter] = []
+        self._sequence = count()
+
+    def _can_admit(self, route_class: RouteClass) -> bool:
+        return self.in_flight < self.capacity and self.class_in_flight[route_class.name] < self.limits[route_class.name]
+
+    def _admit(self, route_class: RouteClass) -> None:
+        self.in_flight += 1
+        self.class_in_flight[route_class.name] += 1
+        self.counters[route_class.name]["admitted"] += 1
+
+    async def acquire(self, route_class: RouteClass) -> bool:
+        """Wait for a slot. Returns False if the request was shed."""
+        # Requests queued ahead in the same class keep their place.
+        if self._can_admit(route_class) and not self.queued[route_class.name]:
+            self._admit(route_class)
+            return True
+
+        if self.queued[route_class.name] >= route_class.max_queue:
+            self.counters[route_class.name]["shed"] += 1
+            return False
+
+        waiter = _Waiter(route_class.priority, next(self._sequence), route_class, asyncio.get_running_loop().create_future())
+        insort(self._waiters, waiter)
+        self.queued[route_class.name] += 1
+        self.counters[route_class.name]["queued"] += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=route_class.max_wait_seconds)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            # The client went away while queued, possibly just after being admitted.
+            if waiter.future.done():
+                self.release(route_class)
+            else:
+                self._abandon(waiter)
+            raise
+
+        if waiter.future.done():
+            return True
+        self._abandon(waiter)
+        self.counters[route_class.name]["timed_out"] += 1
+        return False
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        self._waiters.remove(waiter)
+        self.queued[waiter.route_class.name] -= 1
+
+    def release(self, route_class: RouteClass) -> None:
+        """Free a slot and admit the highest-priority waiters that now fit."""
+        self.in_flight -= 1
+        self.class_in_flight[route_class.name] -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        for waiter in list(self._waiters):
+            if self.in_flight >= self.capacity:
+                break
+            if not self._can_admit(waiter.route_class):
+                # This class is at its share; lower-priority classes may still fit.
+                continue
+            self._abandon(waiter)
+            self._admit(waiter.route_class)
+            waiter.future.set_result(True)
+
+    def snapshot(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "queued": sum(self.queued.values()),
+            "classes": [
+                {
+                    "name": name,
+                    "priority": route_class.priority,
+                    "limit": self.limits[name],
+                    "max_queue": route_class.max_queue,
+                    "max_wait_seconds": route_class.max_wait_seconds,
+                    "in_flight": self.class_in_flight[name],
+                    "queued": self.queued[name],
+                    "admitted": self.counters[name]["admitted"],
+                    "shed": self.counters[name]["shed"],
+                    "timed_out": self.counters[name]["timed_out"],
+                }
+                for name, route_class in self.route_classes.items()
+            ],
+        }
+
+class AdmissionMiddleware:
+    """Admit API requests through the admission controller, shedding with 503."""
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(UNCONTROLLED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        # Only a valid token counts; any other Authorization header is anonymous browsing.
+        authorization = dict(scope["headers"]).get(b"authorization", b"").decode("latin-1")
+        authenticated = bearer_claims(authorization) is not None
+        route_class = classify(scope["method"], scope["path"], authenticated)
+        if not await self.controller.acquire(route_class):
+            await self._reject(send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route_class)
+
+    @staticmethod
+    async def _reject(send) -> None:
+        body = json.dumps({"detail": "Server is busy, please retry shortly"}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"retry-after", str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode("ascii")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+admission_controller = AdmissionController(
+    settings.ADMISSION_CAPACITY or settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+)
@@ -0,0 +1,43 @@
+from typing import List, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+def parse_batch_ids(ids: str) -> Tuple[List[str], List[UUID]]:
+    """Split a comma-separated id list.
+
+    Returns the requested ids, de-duplicated in request order, and the subset
+    that are valid UUIDs and can be looked up.
+    """
+    requested = list(dict.fromkeys(value.strip() for value in ids.split(",") if value.strip()))
+    if len(requested) > settings.BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BATCH_MAX_IDS} ids can be requested at once"
+        )
+    
+    valid = []
+    for value in requested:
+        try:
+            valid.append(UUID(value))
+        except ValueError:
+            continue
+    return requested, valid
+
+def order_batch(requested: List[str], rows: list) -> Tuple[list, List[str]]:
+    """Arrange fetched rows in request order and list the ids that were not found."""
+    by_id = {str(row.id): row for row in rows}
+    items = []
+    missing = []
+    for value in requested:
+        try:
+            row = by_id.get(str(UUID(value)))
+        except ValueError:
+            row = None
+        if row is None:
+            missing.append(value)
+        else:
+            items.append(row)
+    return items, missing
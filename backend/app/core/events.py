@@ -0,0 +1,72 @@
+import logging
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+PLOT_CREATED = "created"
+PLOT_UPDATED = "updated"
+PLOT_DELETED = "deleted"
+
+@dataclass
+class PlotChange:
+    """A committed plot write, with snapshots of the row before and after it."""
+    action: str
+    plot_id: str
+    before: Optional[dict] = None
+    after: Optional[dict] = None
+
+PlotListener = Callable[[PlotChange], None]
+PlotWriteListener = Callable[[Session, PlotChange], None]
+
+_plot_listeners: List[PlotListener] = []
+_plot_write_listeners: List[PlotWriteListener] = []
+
+def on_plot_change(listener: PlotListener) -> PlotListener:
+    """Register a listener called after every committed plot write."""
+    _plot_listeners.append(listener)
+    return listener
+
+def on_plot_write(listener: PlotWriteListener) -> PlotWriteListener:
+    """Register a listener called with the writing session just before a plot write commits.
+
+    Rows it adds to the session, such as jobs, commit atomically with the write.
+    """
+    _plot_write_listeners.append(listener)
+    return listener
+
+def dispatch_plot_change(change: PlotChange) -> None:
+    """Notify listeners of a plot write. Listener errors never fail the write."""
+    for listener in _plot_listeners:
+        try:
+            listener(change)
+        except Exception:
+            logger.exception("Plot change listener %s failed", getattr(listener, "__name__", listener))
+
+# Session.info key holding plot changes made in the session's open transaction.
+_PENDING_CHANGES = "pending_plot_changes"
+
+def record_plot_change(db: Session, change: PlotChange) -> None:
+    """Record a plot write made in db's transaction; listeners run once it commits."""
+    db.info.setdefault(_PENDING_CHANGES, []).append(change)
+
+@event.listens_for(Session, "before_commit")
+def _run_plot_write_listeners(session: Session) -> None:
+    for change in session.info.get(_PENDING_CHANGES, []):
+        for listener in _plot_write_listeners:
+            try:
+                listener(session, change)
+            except Exception:
+                logger.exception("Plot write listener %s failed", getattr(listener, "__name__", listener))
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_committed_changes(session: Session) -> None:
+    for change in session.info.pop(_PENDING_CHANGES, []):
+        dispatch_plot_change(change)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_changes(session: Session) -> None:
+    session.info.pop(_PENDING_CHANGES, None)
@@ -0,0 +1,140 @@
+import csv
+import enum
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterable, Iterator, List, Optional
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+
+EXPORT_FORMATS = ("ndjson", "csv", "geojson")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "geojson": "application/geo+json",
+}
+
+def json_default(value):
+    """JSON encoder fallback for database values.
+
+    Decimals become strings so prices and areas keep their exact value.
+    """
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def encode_ndjson(rows: Iterable[dict]) -> Iterator[str]:
+    """Encode rows as newline-delimited JSON."""
+    for row in rows:
+        yield json.dumps(row, default=json_default, separators=(",", ":")) + "\n"
+
+def encode_csv(rows: Iterable[dict], columns: List[str]) -> Iterator[str]:
+    """Encode rows as CSV with a header line."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_csv_value(row.get(column)) for column in columns])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    yield buffer.getvalue()
+
+def encode_geojson(rows: Iterable[dict], geometry_key: str = "geometry") -> Iterator[str]:
+    """Encode rows as a GeoJSON FeatureCollection, one feature at a time."""
+    yield '{"type":"FeatureCollection","features":['
+    separator = ""
+    for row in rows:
+        properties = dict(row)
+        geometry = properties.pop(geometry_key, None)
+        feature = json.dumps(
+            {"type": "Feature", "id": properties.get("id"), "properties": properties, "geometry": None},
+            default=json_default,
+            separators=(",", ":")
+        )
+        if geometry:
+            # ST_AsGeoJSON already returns serialized JSON, splice it in as-is.
+            feature = feature[:-len("null}")] + geometry + "}"
+        yield separator + feature
+        separator = ","
+    yield "]}\n"
+
+def buffered(chunks: Iterable[str], chunk_bytes: Optional[int] = None) -> Iterator[bytes]:
+    """Coalesce small text chunks into larger byte chunks.
+
+    The first chunk is flushed immediately so clients get the first byte
+    without waiting for a full buffer.
+    """
+    chunk_bytes = chunk_bytes or settings.EXPORT_CHUNK_BYTES
+    parts: List[bytes] = []
+    size = 0
+    first = True
+    for chunk in chunks:
+        data = chunk.encode("utf-8")
+        parts.append(data)
+        size += len(data)
+        if first or size >= chunk_bytes:
+            yield b"".join(parts)
+            parts = []
+            size = 0
+            first = False
+    if parts:
+        yield b"".join(parts)
+
+def gzipped(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Incrementally gzip a byte stream."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def export_response(
+    rows: Iterable[dict],
+    fmt: str,
+    columns: List[str],
+    filename: str,
+    gzip: bool = False
+) -> StreamingResponse:
+    """Build a streaming export response in the requested format.
+
+    rows may read from the request's get_db session: FastAPI (0.104) closes
+    yield dependencies only after the response body has been sent, so an
+    export holds a single pool connection for the whole stream.
+    """
+    if fmt == "csv":
+        chunks = encode_csv(rows, columns)
+    elif fmt == "geojson":
+        chunks = encode_geojson(rows)
+    else:
+        chunks = encode_ndjson(rows)
+
+    body = buffered(chunks)
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    if gzip:
+        body = gzipped(body)
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(body, media_type=MEDIA_TYPES[fmt], headers=headers)
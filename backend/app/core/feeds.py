@@ -0,0 +1,202 @@
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.db.models import PlotStatus
+from app.schemas.plot import Plot
+
+LATEST = "latest"
+FEATURED_PREFIX = "featured:"
+
+# (sort key, plot id, serialized plot); sort keys order newest first.
+FeedEntry = Tuple[Tuple[float, str], str, bytes]
+
+# (sequence, plot id, snapshot, serialized plot) of a change passed to apply().
+FeedChange = Tuple[int, str, Optional[dict], Optional[bytes]]
+
+def featured_feed(region_id: int) -> str:
+    return f"{FEATURED_PREFIX}{region_id}"
+
+def _sort_key(created_at: Optional[datetime], plot_id: str) -> Tuple[float, str]:
+    # Negated so ascending order is newest first.
+    return -(created_at.timestamp() if created_at else 0.0), plot_id
+
+def serialize_plot(plot) -> bytes:
+    """Serialize a Plot row as the public Plot schema."""
+    return Plot.model_validate(plot).model_dump_json().encode("utf-8")
+
+def serialize_snapshot(snapshot: dict) -> bytes:
+    """Serialize a plot change snapshot as the public Plot schema."""
+    lon, lat = snapshot.get("centroid") or (None, None)
+    return Plot(**{**snapshot, "centroid_lon": lon, "centroid_lat": lat}).model_dump_json().encode("utf-8")
+
+def feeds_for(snapshot: dict) -> List[str]:
+    """Names of the feeds a plot belongs in."""
+    if snapshot.get("status") != PlotStatus.AVAILABLE:
+        return []
+    names = [LATEST]
+    if snapshot.get("image_urls") and snapshot.get("region_id") is not None:
+        names.append(featured_feed(snapshot["region_id"]))
+    return names
+
+class FeedStore:
+    """Top plots per feed, held as ready-serialized JSON.
+
+    Each feed keeps up to ``keep`` entries, newest first, so that plots
+    dropping out can be replaced without a query; ``size`` of them are
+    served. A feed that was cut off at ``keep`` and falls below ``size``
+    after removals is marked dirty, and only dirty feeds are refilled from
+    the database between full reloads.
+
+    Changes applied while feeds are read from the database (see
+    ``reading``) are replayed onto the rows that load or refill installs, so
+    a write that lands between the query and the replace is not lost.
+    """
+
+    def __init__(self, size: int, keep: Optional[int] = None):
+        self.size = size
+        self.keep = keep or size * 2
+        self._feeds: Dict[str, List[FeedEntry]] = {}
+        self._payloads: Dict[str, bytes] = {}
+        # Feeds that may be missing eligible plots beyond the ones kept.
+        self._truncated: Set[str] = set()
+        # Truncated feeds that ran short and need a refill.
+        self._dirty: Set[str] = set()
+        self._sequence = 0
+        self._readers = 0
+        self._changes: List[FeedChange] = []
+        self._lock = threading.RLock()
+        self.ready = False
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def dirty_feeds(self) -> Set[str]:
+        with self._lock:
+            return set(self._dirty)
+
+    @contextmanager
+    def reading(self) -> Iterator[int]:
+        """Record changes while feeds are read from the database.
+
+        Yields the change sequence to pass to load or refill, which replay
+        the changes applied after it onto the feeds they replace.
+        """
+        with self._lock:
+            self._readers += 1
+            since = self._sequence
+        try:
+            yield since
+        finally:
+            with self._lock:
+                self._readers -= 1
+                if not self._readers:
+                    self._changes.clear()
+
+    def load(
+        self, feeds: Dict[str, Iterable[Tuple[Optional[datetime], str, bytes]]], since: Optional[int] = None
+    ) -> None:
+        """Replace every feed with (created_at, plot_id, body) rows, at most ``keep`` per feed."""
+        self._replace(feeds, everything=True, since=since)
+
+    def refill(
+        self, feeds: Dict[str, Iterable[Tuple[Optional[datetime], str, bytes]]], since: Optional[int] = None
+    ) -> None:
+        """Replace only the given feeds, leaving the others as they are."""
+        self._replace(feeds, everything=False, since=since)
+
+    def _replace(self, feeds, everything: bool, since: Optional[int]) -> None:
+        loaded = {
+            name: sorted((_sort_key(created_at, plot_id), plot_id, body) for created_at, plot_id, body in rows)
+            for name, rows in feeds.items()
+        }
+        truncated = {name for name, entries in loaded.items() if len(entries) >= self.keep}
+        for entries in loaded.values():
+            del entries[self.keep:]
+        with self._lock:
+            if everything:
+                self._feeds, self._payloads, self._truncated, self._dirty = {}, {}, set(), set()
+            for name, entries in loaded.items():
+                self._feeds[name] = entries
+                self._payloads[name] = self._render(entries)
+                self._dirty.discard(name)
+                if name in truncated:
+                    self._truncated.add(name)
+                else:
+                    self._truncated.discard(name)
+            if since is not None:
+                replaced = None if everything else set(loaded)
+                for sequence, plot_id, snapshot, body in self._changes:
+                    if sequence > since:
+                        self._apply(plot_id, snapshot, body, replaced)
+            if everything:
+                self.ready = True
+
+    def _render(self, entries: List[FeedEntry]) -> bytes:
+        return b"[" + b",".join(body for _, _, body in entries[:self.size]) + b"]"
+
+    def wants(self, snapshot: dict) -> bool:
+        """Whether a plot would rank within any of its feeds."""
+        key = _sort_key(snapshot.get("created_at"), snapshot["id"])
+        with self._lock:
+            for name in feeds_for(snapshot):
+                entries = self._feeds.get(name, [])
+                if len(entries) < self.keep or key < entries[-1][0]:
+                    return True
+        return False
+
+    def apply(self, plot_id: str, snapshot: Optional[dict], body: Optional[bytes] = None) -> None:
+        """Remove a plot from every feed and, if body is given, re-add it to its feeds."""
+        with self._lock:
+            self._sequence += 1
+            if self._readers:
+                self._changes.append((self._sequence, plot_id, snapshot, body))
+            self._apply(plot_id, snapshot, body)
+
+    def _apply(
+        self, plot_id: str, snapshot: Optional[dict], body: Optional[bytes], only: Optional[Set[str]] = None
+    ) -> None:
+        # Callers hold _lock; only limits the change to those feeds.
+        touched: Set[str] = set()
+        for name, entries in self._feeds.items():
+            if only is not None and name not in only:
+                continue
+            kept = [entry for entry in entries if entry[1] != plot_id]
+            if len(kept) != len(entries):
+                self._feeds[name] = kept
+                touched.add(name)
+
+        if snapshot is not None and body is not None:
+            entry = (_sort_key(snapshot.get("created_at"), plot_id), plot_id, body)
+            for name in feeds_for(snapshot):
+                if only is not None and name not in only:
+                    continue
+                entries = self._feeds.setdefault(name, [])
+                entries.append(entry)
+                entries.sort()
+                if len(entries) > self.keep:
+                    del entries[self.keep:]
+                    self._truncated.add(name)
+                touched.add(name)
+
+        for name in touched:
+            entries = self._feeds[name]
+            if name in self._truncated and len(entries) < self.size:
+                self._dirty.add(name)
+            self._payloads[name] = self._render(entries)
+
+    def payload(self, name: str) -> bytes:
+        with self._lock:
+            return self._payloads.get(name, b"[]")
+
+    def featured_payload(self) -> bytes:
+        """Featured plots of every region as one JSON object keyed by region id."""
+        with self._lock:
+            parts = [
+                b'"' + name[len(FEATURED_PREFIX):].encode("ascii") + b'":' + payload
+                for name, payload in sorted(self._payloads.items())
+                if name.startswith(FEATURED_PREFIX) and payload != b"[]"
+            ]
+        return b"{" + b",".join(parts) + b"}"
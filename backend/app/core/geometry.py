@@ -0,0 +1,125 @@
+import math
+from decimal import Decimal
+from typing import List, Optional, Tuple
+
+from geoalchemy2.shape import from_shape
+from shapely.geometry import MultiPolygon, Polygon, mapping, shape
+from shapely.geometry.polygon import orient
+from shapely.validation import explain_validity, make_valid
+
+SRID = 4326
+
+# Mean earth radius in metres, used for spherical area.
+EARTH_RADIUS = 6_371_008.8
+
+# Simplification tolerance in degrees for each map zoom level we serve.
+SIMPLIFY_TOLERANCES = {
+    "6": 0.01,
+    "10": 0.001,
+    "14": 0.0001,
+}
+
+class GeometryError(ValueError):
+    """Raised when a submitted plot geometry cannot be used."""
+
+class PlotOverlapError(ValueError):
+    """Raised when a plot polygon overlaps existing plots beyond the allowed share."""
+
+    def __init__(self, overlaps: List[Tuple[str, Optional[str], float]]):
+        self.overlaps = overlaps
+        plots = ", ".join(f"{plot_number or plot_id} ({ratio:.0%})" for plot_id, plot_number, ratio in overlaps)
+        super().__init__(f"Plot overlaps existing plots: {plots}")
+
+def _parse_geometry(geojson: dict):
+    try:
+        geometry = shape(geojson)
+    except Exception as exc:
+        raise GeometryError(f"Invalid GeoJSON geometry: {exc}")
+
+    if geometry.is_empty:
+        raise GeometryError("Geometry is empty")
+
+    min_lon, min_lat, max_lon, max_lat = geometry.bounds
+    if min_lon < -180 or max_lon > 180 or min_lat < -90 or max_lat > 90:
+        raise GeometryError("Coordinates must be longitude/latitude in EPSG:4326")
+
+    if not geometry.is_valid:
+        reason = explain_validity(geometry)
+        geometry = make_valid(geometry)
+        if geometry.is_empty:
+            raise GeometryError(f"Geometry could not be repaired: {reason}")
+
+    return geometry
+
+def _polygon_parts(geometry) -> List[Polygon]:
+    if isinstance(geometry, Polygon):
+        polygons = [geometry]
+    else:
+        parts = [part for part in getattr(geometry, "geoms", []) if isinstance(part, (Polygon, MultiPolygon))]
+        polygons = [p for part in parts for p in (part.geoms if isinstance(part, MultiPolygon) else [part])]
+    if not polygons:
+        raise GeometryError("Geometry must be a polygon")
+    polygons = [polygon for polygon in polygons if polygon.area > 0]
+    if not polygons:
+        raise GeometryError("Polygon has no area")
+    return polygons
+
+def prepare_polygon(geojson: dict) -> Polygon:
+    """Parse a GeoJSON polygon, repairing it if it is invalid.
+
+    Shapes that are, or are repaired into, several polygons (such as a
+    self-intersecting "bow-tie") are rejected rather than truncated.
+    Coordinates must be longitude/latitude (EPSG:4326).
+    """
+    polygons = _polygon_parts(_parse_geometry(geojson))
+    if len(polygons) > 1:
+        raise GeometryError(
+            f"Geometry is made of {len(polygons)} separate polygons; "
+            "a plot must be a single polygon without self-intersections"
+        )
+    return orient(polygons[0], sign=1.0)
+
+def prepare_boundary(geojson: dict) -> MultiPolygon:
+    """Parse a GeoJSON polygon or multipolygon boundary, repairing it if it is invalid."""
+    return MultiPolygon([orient(polygon, sign=1.0) for polygon in _polygon_parts(_parse_geometry(geojson))])
+
+def _ring_area(coords) -> float:
+    """Signed spherical area of a lon/lat ring in square metres."""
+    area = 0.0
+    points = list(coords)
+    for (lon1, lat1), (lon2, lat2) in zip(points, points[1:]):
+        area += math.radians(lon2 - lon1) * (2 + math.sin(math.radians(lat1)) + math.sin(math.radians(lat2)))
+    return area * EARTH_RADIUS * EARTH_RADIUS / 2
+
+def geodesic_area(polygon: Polygon) -> float:
+    """Area of a lon/lat polygon on the sphere, in square metres."""
+    area = abs(_ring_area(polygon.exterior.coords))
+    for interior in polygon.interiors:
+        area -= abs(_ring_area(interior.coords))
+    return area
+
+def derive_geometry_fields(polygon: Polygon) -> dict:
+    """Compute the stored geometry columns for a prepared polygon."""
+    centroid = polygon.centroid
+    min_lon, min_lat, max_lon, max_lat = polygon.bounds
+    return {
+        "geom": from_shape(polygon, srid=SRID),
+        "geom_area_sqm": Decimal(str(round(geodesic_area(polygon), 2))),
+        "centroid": from_shape(centroid, srid=SRID),
+        "centroid_lon": centroid.x,
+        "centroid_lat": centroid.y,
+        "bbox_min_lon": min_lon,
+        "bbox_min_lat": min_lat,
+        "bbox_max_lon": max_lon,
+        "bbox_max_lat": max_lat,
+        "geom_simplified": {
+            zoom: mapping(polygon.simplify(tolerance, preserve_topology=True))
+            for zoom, tolerance in SIMPLIFY_TOLERANCES.items()
+        },
+    }
+
+def price_per_sqm(price: Optional[Decimal], area_sqm: Optional[Decimal]) -> Optional[Decimal]:
+    """Price divided by area, rounded to cents."""
+    if price is None or not area_sqm:
+        return None
+    return (Decimal(price) / Decimal(area_sqm)).quantize(Decimal("0.01"))
@@ -0,0 +1,151 @@
+import asyncio
+import hashlib
+import json
+import time
+from typing import Dict, Optional
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.scheduler import schedule_periodic
+from app.crud.crud_idempotency import (
+    reserve_idempotency_key, complete_idempotency_key, release_idempotency_key,
+    purge_expired_idempotency_keys
+)
+from app.db.session import BackgroundSessionLocal
+
+MAX_KEY_LENGTH = 255
+
+# Requests waiting on a key owned by a request in this same process are woken
+# as soon as it finishes instead of at their next poll.
+_in_flight: Dict[bytes, asyncio.Event] = {}
+
+def _digest(value: str) -> bytes:
+    return hashlib.sha256(value.encode("utf-8")).digest()
+
+class IdempotentRequest:
+    """Replay the stored response for a repeated ``Idempotency-Key``.
+
+    Usage in an endpoint::
+
+        async with IdempotentRequest(db, idempotency_key, scope, payload) as idempotent:
+            if idempotent.replay is not None:
+                return idempotent.replay
+            ...
+            return idempotent.complete(result)
+
+    The first request with a key claims it; retries with the same key and
+    payload get the stored response without running the handler, and retries
+    that arrive while the first is still running wait for it. ``complete``
+    commits the handler's writes together with the stored response, so a
+    crash can never leave one without the other. If the handler raises, the
+    key is released so the client can retry. The claim is a lease of
+    ``IDEMPOTENCY_LEASE_SECONDS``: if the request holding it dies, a retry
+    with the same payload can claim the key once the lease has passed.
+
+    The lease is not renewed, so it also bounds how long a handler may run.
+    A handler still running when a retry takes the key over has its writes
+    rolled back and gets 409 from ``complete``.
+    """
+
+    def __init__(self, db: Session, key: Optional[str], scope: str, payload: BaseModel):
+        self.db = db
+        self.key = key
+        self.scope = scope
+        self.payload = payload
+        self.replay: Optional[JSONResponse] = None
+        self._key_hash: Optional[bytes] = None
+        self._locked_until = None
+        self._owner = False
+        self._completed = False
+
+    async def __aenter__(self) -> "IdempotentRequest":
+        if not self.key:
+            return self
+        if len(self.key) > MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Idempotency-Key is too long"
+            )
+        
+        self._key_hash = _digest(f"{self.scope}:{self.key}")
+        request_hash = _digest(json.dumps(jsonable_encoder(self.payload), sort_keys=True))
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+        delay = 0.05
+        
+        while True:
+            existing = reserve_idempotency_key(
+                self.db, self._key_hash, request_hash,
+                settings.IDEMPOTENCY_TTL_SECONDS, settings.IDEMPOTENCY_LEASE_SECONDS
+            )
+            if existing["claimed"]:
+                self._owner = True
+                self._locked_until = existing["locked_until"]
+                _in_flight[self._key_hash] = asyncio.Event()
+                return self
+            
+            if existing["request_hash"] != request_hash:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Idempotency-Key was already used with a different request"
+                )
+            
+            if existing["status_code"] is not None:
+                self.replay = JSONResponse(
+                    content=existing["response_body"],
+                    status_code=existing["status_code"],
+                    headers={"Idempotent-Replayed": "true"}
+                )
+                return self
+            
+            if time.monotonic() >= deadline:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A request with this Idempotency-Key is still in progress",
+                    headers={"Retry-After": "1"}
+                )
+            
+            event = _in_flight.get(self._key_hash)
+            try:
+                await asyncio.wait_for(event.wait() if event else asyncio.sleep(delay), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, 0.5)
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if not self._owner:
+            return
+        if not self._completed:
+            self.db.rollback()
+            release_idempotency_key(self.db, self._key_hash, self._locked_until)
+        event = _in_flight.pop(self._key_hash, None)
+        if event is not None:
+            event.set()
+
+    def complete(self, body, status_code: int = status.HTTP_200_OK):
+        """Commit the handler's writes with the stored response and return the body unchanged."""
+        if self._owner and not complete_idempotency_key(
+            self.db, self._key_hash, self._locked_until, status_code, jsonable_encoder(body)
+        ):
+            # Our lease ran out and a retry took the key over; its result wins.
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="The request took too long and was superseded by a retry with the same Idempotency-Key",
+                headers={"Retry-After": "1"}
+            )
+        self.db.commit()
+        self._completed = True
+        return body
+
+def _purge_expired_keys() -> None:
+    db = BackgroundSessionLocal()
+    try:
+        purge_expired_idempotency_keys(db)
+    finally:
+        db.close()
+
+schedule_periodic("purge-idempotency-keys", 600, _purge_expired_keys)
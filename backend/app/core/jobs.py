@@ -0,0 +1,207 @@
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.scheduler import schedule_periodic
+from app.crud.crud_job import (
+    enqueue_job, claim_job, complete_job, fail_job, renew_job_lease, requeue_stale_jobs, purge_finished_jobs
+)
+from app.db.models import Job
+from app.db.session import BackgroundSessionLocal
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[dict], Union[None, Awaitable[None]]]
+
+_handlers: Dict[str, JobHandler] = {}
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register the handler for a job kind. Handlers receive the job payload."""
+    def register(handler: JobHandler) -> JobHandler:
+        _handlers[kind] = handler
+        return handler
+    return register
+
+class JobMetrics:
+    """Per-process counters for queue activity."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Counter = Counter()
+        self.by_kind: Dict[str, Counter] = {}
+        self.total_runtime_seconds = 0.0
+
+    def incr(self, name: str, kind: Optional[str] = None) -> None:
+        with self._lock:
+            self.counters[name] += 1
+            if kind is not None:
+                self.by_kind.setdefault(kind, Counter())[name] += 1
+
+    def observe_runtime(self, seconds: float) -> None:
+        with self._lock:
+            self.total_runtime_seconds += seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "by_kind": {kind: dict(counts) for kind, counts in self.by_kind.items()},
+                "total_runtime_seconds": round(self.total_runtime_seconds, 3),
+            }
+
+metrics = JobMetrics()
+
+def _with_session(func, *args):
+    db = BackgroundSessionLocal()
+    try:
+        return func(db, *args)
+    finally:
+        db.close()
+
+class JobWorkerPool:
+    """Asyncio workers that claim jobs from the jobs table and run their handlers."""
+
+    def __init__(self, concurrency: int, poll_interval: float):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._work(number), name=f"job-worker-{number}")
+            for number in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def wake(self) -> None:
+        """Wake idle workers early, e.g. right after a job was enqueued. Thread-safe."""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _work(self, number: int) -> None:
+        while True:
+            try:
+                job = await asyncio.to_thread(_with_session, claim_job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Job worker %s could not claim a job", number)
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self.run(job)
+
+    async def _heartbeat(self, job_id: int) -> None:
+        # Keeps requeue_stale_jobs from handing a long-running job to another worker.
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+            try:
+                await asyncio.to_thread(_with_session, renew_job_lease, job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Could not renew the lease of job %s", job_id)
+
+    async def run(self, job: dict) -> None:
+        kind = job["kind"]
+        metrics.incr("claimed", kind)
+        started = time.perf_counter()
+        heartbeat = asyncio.create_task(self._heartbeat(job["id"]))
+        try:
+            handler = _handlers.get(kind)
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind {kind!r}")
+            if inspect.iscoroutinefunction(handler):
+                await handler(job["payload"])
+            else:
+                await asyncio.to_thread(handler, job["payload"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed on attempt %s", job["id"], kind, job["attempts"])
+            retry = await asyncio.to_thread(
+                _with_session, fail_job, job["id"], job["attempts"], job["max_attempts"], repr(exc)
+            )
+            metrics.incr("retried" if retry else "failed", kind)
+        else:
+            await asyncio.to_thread(_with_session, complete_job, job["id"])
+            metrics.incr("succeeded", kind)
+        finally:
+            heartbeat.cancel()
+            metrics.observe_runtime(time.perf_counter() - started)
+
+_pool: Optional[JobWorkerPool] = None
+
+# Session.info flag set when a job was added to the session's open transaction.
+_WAKE_ON_COMMIT = "wake_job_workers"
+
+def enqueue(db: Session, kind: str, payload: Optional[dict] = None, commit: bool = True, **options) -> Job:
+    """Enqueue a job and wake this process's workers, if any are running.
+
+    With commit=False the job commits with the caller's transaction (an
+    outbox write) and workers are woken once it does.
+    """
+    db_job = enqueue_job(db, kind, payload, commit=commit, **options)
+    metrics.incr("enqueued", kind)
+    if commit:
+        _wake_workers()
+    else:
+        db.info[_WAKE_ON_COMMIT] = True
+    return db_job
+
+def _wake_workers() -> None:
+    if _pool is not None:
+        _pool.wake()
+
+@event.listens_for(Session, "after_commit")
+def _wake_workers_on_commit(session: Session) -> None:
+    if session.info.pop(_WAKE_ON_COMMIT, False):
+        _wake_workers()
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_jobs(session: Session) -> None:
+    session.info.pop(_WAKE_ON_COMMIT, None)
+
+async def start_job_workers(concurrency: int) -> JobWorkerPool:
+    """Start the worker pool for this process."""
+    # Importing the handler modules registers their job kinds.
+    from app.core import notifications  # noqa: F401
+
+    global _pool
+    _pool = JobWorkerPool(concurrency, settings.JOB_POLL_INTERVAL)
+    await _pool.start()
+    return _pool
+
+async def stop_job_workers() -> None:
+    """Stop the worker pool for this process."""
+    global _pool
+    if _pool is not None:
+        await _pool.stop()
+        _pool = None
+
+schedule_periodic("requeue-stale-jobs", settings.JOB_LEASE_SECONDS, lambda: _with_session(requeue_stale_jobs))
+schedule_periodic("purge-finished-jobs", 3600, lambda: _with_session(purge_finished_jobs))
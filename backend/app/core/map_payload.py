@@ -0,0 +1,78 @@
+import json
+import math
+import struct
+import sys
+from array import array
+from typing import List, Sequence, Tuple
+
+from app.db.models import PlotStatus
+
+MAP_FORMATS = ("columns", "packed")
+
+MEDIA_TYPES = {
+    "columns": "application/json",
+    "packed": "application/octet-stream",
+}
+
+# Status codes are indexes into this list, in enum declaration order.
+STATUS_CODES = list(PlotStatus)
+STATUS_INDEX = {plot_status: code for code, plot_status in enumerate(STATUS_CODES)}
+
+# Packed payload layout (all little-endian), chosen so every array starts on
+# a multiple of its element size:
+#   magic b"PMP1", uint32 count
+#   price float64[count]
+#   lon   float32[count]   (NaN where unknown)
+#   lat   float32[count]   (NaN where unknown)
+#   id    16-byte UUID[count]
+#   status uint8[count]    (index into STATUS_CODES)
+PACKED_MAGIC = b"PMP1"
+PACKED_HEADER = struct.Struct("<4sI")
+
+# (id, centroid_lon, centroid_lat, price, status), as selected by get_plot_points.
+PlotPoint = Tuple
+
+def _coordinate(value) -> float:
+    return math.nan if value is None else value
+
+def _columns(points: Sequence[PlotPoint]) -> Tuple[list, list, list, list, list]:
+    if not points:
+        return [], [], [], [], []
+    ids, lons, lats, prices, statuses = zip(*points)
+    return list(ids), list(lons), list(lats), list(prices), list(statuses)
+
+def encode_columns(points: Sequence[PlotPoint]) -> bytes:
+    """Encode plot points as JSON column arrays."""
+    ids, lons, lats, prices, statuses = _columns(points)
+    body = {
+        "count": len(ids),
+        "statuses": [plot_status.value for plot_status in STATUS_CODES],
+        "id": [str(plot_id) for plot_id in ids],
+        "lon": lons,
+        "lat": lats,
+        "price": [float(price) for price in prices],
+        "status": [STATUS_INDEX[plot_status] for plot_status in statuses],
+    }
+    return json.dumps(body, separators=(",", ":")).encode("utf-8")
+
+def encode_packed(points: Sequence[PlotPoint]) -> bytes:
+    """Encode plot points as little-endian packed arrays (see PACKED layout above)."""
+    ids, lons, lats, prices, statuses = _columns(points)
+    numeric = [
+        array("d", [float(price) for price in prices]),
+        array("f", [_coordinate(lon) for lon in lons]),
+        array("f", [_coordinate(lat) for lat in lats]),
+    ]
+    if sys.byteorder == "big":
+        for column in numeric:
+            column.byteswap()
+    parts: List[bytes] = [PACKED_HEADER.pack(PACKED_MAGIC, len(ids))]
+    parts.extend(column.tobytes() for column in numeric)
+    parts.append(b"".join(plot_id.bytes for plot_id in ids))
+    parts.append(bytes(STATUS_INDEX[plot_status] for plot_status in statuses))
+    return b"".join(parts)
+
+ENCODERS = {
+    "columns": encode_columns,
+    "packed": encode_packed,
+}
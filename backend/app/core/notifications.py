@@ -0,0 +1,85 @@
+import logging
+from typing import Optional
+
+from app.core.jobs import job_handler
+from app.crud.crud_order import get_order
+from app.crud.crud_plot import get_plot
+from app.crud.crud_saved_search import get_saved_searches_by_ids, mark_searches_notified
+from app.db.session import BackgroundSessionLocal
+
+logger = logging.getLogger(__name__)
+
+ORDER_CREATED = "order.created"
+ORDER_STATUS_CHANGED = "order.status_changed"
+SAVED_SEARCH_MATCHED = "saved_search.matched"
+
+def send_notification(email: Optional[str], subject: str, body: str) -> None:
+    """Deliver a notification to a user.
+
+    There is no mail transport configured yet, so notifications are written
+    to the application log where they can be picked up by log shipping.
+    """
+    if not email:
+        return
+    logger.info("Notification to %s: %s - %s", email, subject, body)
+
+def _plot_label(order) -> str:
+    plot = order.plot
+    return plot.plot_number or plot.title if plot else str(order.plot_id)
+
+@job_handler(ORDER_CREATED)
+def notify_order_created(payload: dict) -> None:
+    db = BackgroundSessionLocal()
+    try:
+        order = get_order(db, payload["order_id"])
+        if not order:
+            return
+        send_notification(
+            order.user.email,
+            "Order received",
+            f"Your order for plot {_plot_label(order)} has been received and is pending payment."
+        )
+    finally:
+        db.close()
+
+@job_handler(ORDER_STATUS_CHANGED)
+def notify_order_status_changed(payload: dict) -> None:
+    db = BackgroundSessionLocal()
+    try:
+        order = get_order(db, payload["order_id"])
+        if not order:
+            return
+        send_notification(
+            order.user.email,
+            "Order updated",
+            f"Your order for plot {_plot_label(order)} changed from "
+            f"{payload.get('previous_status')} to {payload.get('order_status')}."
+        )
+    finally:
+        db.close()
+
+@job_handler(SAVED_SEARCH_MATCHED)
+def notify_saved_search_matched(payload: dict) -> None:
+    db = BackgroundSessionLocal()
+    try:
+        plot = get_plot(db, payload["plot_id"])
+        if not plot:
+            return
+        searches = get_saved_searches_by_ids(db, payload["saved_search_ids"])
+        
+        # One message per user, however many of their searches matched.
+        names_by_user = {}
+        for search in searches:
+            if search.notify:
+                names_by_user.setdefault(search.user, []).append(search.name)
+        for user, names in names_by_user.items():
+            send_notification(
+                user.email,
+                "New plot matches your saved search",
+                f"Plot {plot.plot_number or plot.title} in {plot.council.name if plot.council else 'Tanzania'} "
+                f"is now available for {plot.price} and matches: {', '.join(names)}."
+            )
+        
+        mark_searches_notified(db, [search.id for search in searches])
+    finally:
+        db.close()
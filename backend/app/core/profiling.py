@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import os
+import re
+import time
+import uuid
+from typing import Optional
+from urllib.parse import parse_qs
+
+from app.core.config import settings
+from app.core.security import bearer_claims
+from app.crud.crud_user import get_user_by_email
+from app.db.models import UserRole
+from app.db.session import BackgroundSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Only these endpoints can be profiled; both slash forms are listed because
+# the redirect to the canonical path is a separate request.
+PROFILED_PATHS = frozenset({"/api/plots", "/api/plots/", "/api/orders", "/api/orders/"})
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+def profile_path(profile_id: str) -> Optional[str]:
+    """Filesystem path of a stored profile, or None for a malformed id."""
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    return os.path.join(settings.PROFILE_DIR, f"{profile_id}.speedscope.json")
+
+def _wants_profile(scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"x-profile" and value not in (b"", b"0", b"false"):
+            return True
+    query_string = scope.get("query_string", b"")
+    if b"profile" in query_string:
+        values = parse_qs(query_string.decode("latin-1")).get("profile", [])
+        return any(value not in ("", "0", "false") for value in values)
+    return False
+
+ADMIN_ROLES = (UserRole.ADMIN.value, UserRole.MASTER_ADMIN.value)
+
+def _is_admin(email: str) -> bool:
+    db = BackgroundSessionLocal()
+    try:
+        user = get_user_by_email(db, email=email)
+        return bool(user and user.is_active and user.role in (UserRole.ADMIN, UserRole.MASTER_ADMIN))
+    finally:
+        db.close()
+
+class ProfilingMiddleware:
+    """Sample-profile single admin requests that ask for it.
+
+    A GET to one of ``PROFILED_PATHS`` with an ``X-Profile: 1`` header or a
+    ``profile=1`` query parameter, sent by an admin, runs under pyinstrument.
+    The speedscope profile is written to ``PROFILE_DIR`` and its id returned
+    in the ``X-Profile-Id`` response header. At most one request is profiled
+    at a time and at most one every ``PROFILE_MIN_INTERVAL_SECONDS``; other
+    requests pass straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._running = False
+        self._last_started = float("-inf")
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or scope["path"] not in PROFILED_PATHS
+            or not _wants_profile(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if self._running or time.monotonic() - self._last_started < settings.PROFILE_MIN_INTERVAL_SECONDS:
+            await self.app(scope, receive, send)
+            return
+
+        # Only tokens that claim an admin role get as far as the database.
+        authorization = dict(scope["headers"]).get(b"authorization", b"").decode("latin-1")
+        claims = bearer_claims(authorization)
+        if not claims or not claims.get("sub") or claims.get("role") not in ADMIN_ROLES:
+            await self.app(scope, receive, send)
+            return
+
+        # Claim the slot and start the interval before the (threaded) admin
+        # check, so concurrent requests cannot both profile and there is at
+        # most one lookup per interval.
+        self._running = True
+        self._last_started = time.monotonic()
+        try:
+            if not await asyncio.to_thread(_is_admin, claims["sub"]):
+                self._running = False
+                await self.app(scope, receive, send)
+                return
+            await self._profile(scope, receive, send)
+        finally:
+            self._running = False
+
+    async def _profile(self, scope, receive, send):
+        # Imported lazily so the profiler is only loaded once it is used.
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import SpeedscopeRenderer
+
+        profile_id = uuid.uuid4().hex
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile_id.encode("ascii"))
+                ]
+            await send(message)
+
+        profiler = Profiler(interval=settings.PROFILE_SAMPLE_INTERVAL, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop()
+        await asyncio.to_thread(self._save, profile_id, profiler.output(renderer=SpeedscopeRenderer()))
+        logger.info("Profiled %s?%s as %s", scope["path"], scope.get("query_string", b"").decode("latin-1"), profile_id)
+
+    @staticmethod
+    def _save(profile_id: str, profile: str) -> None:
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        with open(profile_path(profile_id), "w", encoding="utf-8") as profile_file:
+            profile_file.write(profile)
@@ -0,0 +1,155 @@
+import threading
+from bisect import bisect_right, insort
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.db.models import PlotStatus
+from app.schemas.plot import PlotSearch
+
+# Bucket keys: the most specific location a search filters on, and its usage
+# type, with None standing for "any".
+LocationKey = Tuple[str, Optional[int]]
+BucketKey = Tuple[LocationKey, Optional[str]]
+
+# Searches without a minimum price sort before every real price.
+NO_MIN_PRICE = Decimal("-Infinity")
+
+def _location_key(criteria: PlotSearch) -> LocationKey:
+    if criteria.council_id:
+        return "council", criteria.council_id
+    if criteria.district_id:
+        return "district", criteria.district_id
+    if criteria.region_id:
+        return "region", criteria.region_id
+    return "any", None
+
+def _plot_location_keys(plot: dict) -> List[LocationKey]:
+    return [
+        ("council", plot.get("council_id")),
+        ("district", plot.get("district_id")),
+        ("region", plot.get("region_id")),
+        ("any", None),
+    ]
+
+def matches_plot(criteria: PlotSearch, plot: dict) -> bool:
+    """Whether a plot snapshot satisfies every filter of a saved search."""
+    if criteria.status and criteria.status != plot.get("status"):
+        return False
+    if criteria.usage_type and criteria.usage_type != plot.get("usage_type"):
+        return False
+    if criteria.council_id and criteria.council_id != plot.get("council_id"):
+        return False
+    if criteria.district_id and criteria.district_id != plot.get("district_id"):
+        return False
+    if criteria.region_id and criteria.region_id != plot.get("region_id"):
+        return False
+
+    price = plot.get("price")
+    if criteria.min_price is not None and (price is None or price < criteria.min_price):
+        return False
+    if criteria.max_price is not None and (price is None or price > criteria.max_price):
+        return False
+
+    area = plot.get("area_sqm")
+    if criteria.min_area is not None and (area is None or area < criteria.min_area):
+        return False
+    if criteria.max_area is not None and (area is None or area > criteria.max_area):
+        return False
+
+    if criteria.search:
+        term = criteria.search.casefold()
+        text = f"{plot.get('title') or ''}\n{plot.get('description') or ''}".casefold()
+        if term not in text:
+            return False
+
+    return True
+
+class SavedSearchIndex:
+    """Inverted index from plot attributes to the saved searches they may match.
+
+    Searches are bucketed by (location, usage type) and kept sorted by
+    minimum price within each bucket. A plot only looks at the eight buckets
+    its council, district, region and usage type map to, and within each only
+    at searches whose minimum price it meets; the remaining filters are then
+    checked exactly.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[BucketKey, List[Tuple[Decimal, str]]] = {}
+        self._searches: Dict[str, Tuple[str, PlotSearch, BucketKey]] = {}
+        self._lock = threading.RLock()
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._searches)
+
+    @staticmethod
+    def _entry(search_id: str, criteria: PlotSearch) -> Tuple[BucketKey, Tuple[Decimal, str]]:
+        bucket = (_location_key(criteria), criteria.usage_type or None)
+        min_price = criteria.min_price if criteria.min_price is not None else NO_MIN_PRICE
+        return bucket, (min_price, search_id)
+
+    def load(self, searches: Iterable[Tuple[str, str, PlotSearch]]) -> None:
+        """Bulk-load (search_id, user_id, criteria) tuples, replacing the current contents."""
+        buckets: Dict[BucketKey, List[Tuple[Decimal, str]]] = {}
+        entries: Dict[str, Tuple[str, PlotSearch, BucketKey]] = {}
+        for search_id, user_id, criteria in searches:
+            bucket, entry = self._entry(search_id, criteria)
+            buckets.setdefault(bucket, []).append(entry)
+            entries[search_id] = (user_id, criteria, bucket)
+        for entries_in_bucket in buckets.values():
+            entries_in_bucket.sort()
+        with self._lock:
+            self._buckets = buckets
+            self._searches = entries
+            self.ready = True
+
+    def add(self, search_id: str, user_id: str, criteria: PlotSearch) -> None:
+        """Add or replace a single saved search."""
+        with self._lock:
+            self.remove(search_id)
+            bucket, entry = self._entry(search_id, criteria)
+            insort(self._buckets.setdefault(bucket, []), entry)
+            self._searches[search_id] = (user_id, criteria, bucket)
+
+    def remove(self, search_id: str) -> None:
+        """Remove a saved search if present."""
+        with self._lock:
+            indexed = self._searches.pop(search_id, None)
+            if indexed is None:
+                return
+            _, criteria, bucket = indexed
+            entries = self._buckets.get(bucket, [])
+            _, entry = self._entry(search_id, criteria)
+            if entry in entries:
+                entries.remove(entry)
+            if not entries:
+                self._buckets.pop(bucket, None)
+
+    def match(self, plot: dict) -> List[Tuple[str, str]]:
+        """Return (search_id, user_id) for every saved search the plot matches."""
+        price = plot.get("price")
+        price_key = (price if price is not None else NO_MIN_PRICE, "\uffff")
+        usage_keys = [plot.get("usage_type"), None] if plot.get("usage_type") else [None]
+        matched = []
+        with self._lock:
+            for location in _plot_location_keys(plot):
+                for usage_type in usage_keys:
+                    entries = self._buckets.get((location, usage_type))
+                    if not entries:
+                        continue
+                    # Searches with a minimum price above this plot's price sort last.
+                    end = bisect_right(entries, price_key)
+                    for _, search_id in entries[:end]:
+                        user_id, criteria, _ = self._searches[search_id]
+                        if matches_plot(criteria, plot):
+                            matched.append((search_id, user_id))
+        return matched
+
+def became_available(before: Optional[dict], after: Optional[dict]) -> bool:
+    """Whether a plot change created an available plot or made one available."""
+    if not after or after.get("status") != PlotStatus.AVAILABLE:
+        return False
+    return not before or before.get("status") != PlotStatus.AVAILABLE
+
+saved_search_index = SavedSearchIndex()
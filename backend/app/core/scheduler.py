@@ -0,0 +1,55 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PeriodicTask:
+    name: str
+    interval_seconds: float
+    func: Callable[[], None]
+    run_at_startup: bool = False
+    task: Optional[asyncio.Task] = None
+
+_periodic_tasks: List[PeriodicTask] = []
+
+def schedule_periodic(name: str, interval_seconds: float, func: Callable[[], None], run_at_startup: bool = False) -> None:
+    """Register a blocking function to run every interval in a worker thread."""
+    _periodic_tasks.append(PeriodicTask(name, interval_seconds, func, run_at_startup))
+
+async def _run_periodic(periodic: PeriodicTask) -> None:
+    if not periodic.run_at_startup:
+        await asyncio.sleep(periodic.interval_seconds)
+    while True:
+        try:
+            await asyncio.to_thread(periodic.func)
+        except Exception:
+            logger.exception("Periodic task %s failed", periodic.name)
+        await asyncio.sleep(periodic.interval_seconds)
+
+async def start_scheduler() -> None:
+    """Start all registered periodic tasks on the running event loop."""
+    for periodic in _periodic_tasks:
+        if periodic.task is None:
+            periodic.task = asyncio.create_task(_run_periodic(periodic), name=periodic.name)
+
+async def run_startup_tasks() -> None:
+    """Run every task registered with run_at_startup once, without scheduling repeats.
+
+    Used when the scheduler is disabled so in-memory indexes are still built.
+    """
+    for periodic in _periodic_tasks:
+        if periodic.run_at_startup:
+            try:
+                await asyncio.to_thread(periodic.func)
+            except Exception:
+                logger.exception("Startup task %s failed", periodic.name)
+
+async def stop_scheduler() -> None:
+    """Cancel running periodic tasks."""
+    for periodic in _periodic_tasks:
+        if periodic.task is not None:
+            periodic.task.cancel()
+            periodic.task = None
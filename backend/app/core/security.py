@@ -38,4 +38,13 @@ def verify_token(token: str) -> dict:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+        )
+
+def bearer_claims(authorization: Optional[str]) -> Optional[dict]:
+    """Claims of a valid ``Bearer`` token from an Authorization header, or None. No database access."""
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    try:
+        return jwt.decode(authorization[7:], settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
@@ -0,0 +1,133 @@
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Lower ranks sort first in suggestions.
+KIND_RANKS = {"region": 0, "district": 1, "council": 2, "plot": 3}
+
+# Upper bound on index keys scanned per lookup, which keeps lookups
+# sub-millisecond even for very common prefixes.
+MAX_SCAN = 500
+
+def normalize(text: str) -> str:
+    """Case- and accent-insensitive form of text with collapsed whitespace."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+@dataclass(frozen=True)
+class Suggestion:
+    kind: str
+    id: str
+    label: str
+    detail: Optional[str] = None
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.kind, self.id
+
+def _index_terms(label: str) -> List[str]:
+    """The normalized label and every word-suffix of it, so "Es Sal" finds "Dar es Salaam"."""
+    words = normalize(label).split(" ")
+    return [" ".join(words[start:]) for start in range(len(words)) if words[start]]
+
+class PrefixIndex:
+    """Sorted-key prefix index supporting incremental adds and removes.
+
+    Keys are "<term>\\x00<kind>\\x00<id>" strings kept in sorted order, so a
+    prefix lookup is a binary search followed by a short forward scan.
+    """
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._entries: Dict[Tuple[str, str], Suggestion] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _entry_keys(suggestion: Suggestion) -> List[str]:
+        return [f"{term}\x00{suggestion.kind}\x00{suggestion.id}" for term in _index_terms(suggestion.label)]
+
+    def load(self, suggestions: Iterable[Suggestion]) -> None:
+        """Bulk-load suggestions, replacing the current contents."""
+        entries = {suggestion.key: suggestion for suggestion in suggestions}
+        keys = sorted(key for suggestion in entries.values() for key in self._entry_keys(suggestion))
+        with self._lock:
+            self._entries = entries
+            self._keys = keys
+
+    def add(self, suggestion: Suggestion) -> None:
+        """Add or replace a single suggestion."""
+        with self._lock:
+            self.remove(*suggestion.key)
+            self._entries[suggestion.key] = suggestion
+            for key in self._entry_keys(suggestion):
+                insort(self._keys, key)
+
+    def remove(self, kind: str, entry_id: str) -> None:
+        """Remove a suggestion if present."""
+        with self._lock:
+            suggestion = self._entries.pop((kind, entry_id), None)
+            if suggestion is None:
+                return
+            for key in self._entry_keys(suggestion):
+                position = bisect_left(self._keys, key)
+                if position < len(self._keys) and self._keys[position] == key:
+                    del self._keys[position]
+
+    def search(self, query: str, limit: int = 10) -> List[Suggestion]:
+        """Suggestions whose label, or a word-suffix of it, starts with query."""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        matches: Dict[Tuple[str, str], Suggestion] = {}
+        with self._lock:
+            position = bisect_left(self._keys, prefix)
+            end = min(position + MAX_SCAN, len(self._keys))
+            while position < end and self._keys[position].startswith(prefix):
+                _, kind, entry_id = self._keys[position].split("\x00")
+                suggestion = self._entries.get((kind, entry_id))
+                if suggestion is not None:
+                    matches[suggestion.key] = suggestion
+                position += 1
+
+        def rank(suggestion: Suggestion):
+            label = normalize(suggestion.label)
+            return (
+                label != prefix,
+                not label.startswith(prefix),
+                KIND_RANKS.get(suggestion.kind, len(KIND_RANKS)),
+                len(label),
+                label,
+            )
+
+        return sorted(matches.values(), key=rank)[:limit]
+
+class SuggestIndex:
+    """Location and plot-number suggestions.
+
+    Locations and plots are kept in separate indexes so the (few) locations
+    are never crowded out of the scan window by (many) plot numbers.
+    """
+
+    def __init__(self):
+        self.locations = PrefixIndex()
+        self.plots = PrefixIndex()
+        self.ready = False
+
+    def search(self, query: str, limit: int = 10) -> List[Suggestion]:
+        return (self.locations.search(query, limit) + self.plots.search(query, limit))[:limit]
+
+    def set_plot(self, plot_id: str, plot_number: Optional[str], title: Optional[str] = None) -> None:
+        """Add, update or remove the suggestion for one plot."""
+        if plot_number:
+            self.plots.add(Suggestion("plot", plot_id, plot_number, title))
+        else:
+            self.plots.remove("plot", plot_id)
+
+suggest_index = SuggestIndex()
@@ -0,0 +1,38 @@
+from typing import List, Optional
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+from app.db.views import plot_price_stats
+
+# Arbitrary application-wide key so only one process refreshes at a time.
+PRICE_STATS_REFRESH_LOCK = 720_028
+
+def get_price_stats(
+    db: Session,
+    level: str,
+    area_id: Optional[int] = None,
+    usage_type: Optional[str] = None,
+    by_usage: bool = False
+) -> List[dict]:
+    """Get price-per-sqm statistics from the materialized aggregate."""
+    query = select(plot_price_stats).where(plot_price_stats.c.level == level)
+    
+    if area_id is not None:
+        query = query.where(plot_price_stats.c.area_id == area_id)
+    
+    if usage_type is not None:
+        query = query.where(plot_price_stats.c.usage_type == usage_type)
+    elif not by_usage:
+        query = query.where(plot_price_stats.c.usage_type == "*")
+    
+    query = query.order_by(plot_price_stats.c.area_name, plot_price_stats.c.usage_type)
+    return [row._asdict() for row in db.execute(query)]
+
+def refresh_price_stats(db: Session) -> bool:
+    """Refresh the aggregate without blocking readers. Returns False if another process holds the lock."""
+    locked = db.execute(select(func.pg_try_advisory_xact_lock(PRICE_STATS_REFRESH_LOCK))).scalar()
+    if not locked:
+        db.rollback()
+        return False
+    db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY plot_price_stats"))
+    db.commit()
+    return True
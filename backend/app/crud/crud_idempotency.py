@@ -0,0 +1,93 @@
+from datetime import timedelta
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.db.models import IdempotencyKey
+
+def reserve_idempotency_key(
+    db: Session, key_hash: bytes, request_hash: bytes, ttl_seconds: int, lease_seconds: float
+) -> dict:
+    """Claim a key for a new request, or return its existing record.
+
+    A claimed key is returned as ``{"claimed": True, "locked_until": ...}``;
+    that lease identifies the owner to complete and release. Expired
+    records are taken over as if they did not exist. In-progress records
+    whose lease ran out (the request holding them died) are taken over only
+    by a retry of the same request; a different payload gets the record back.
+    """
+    expires_at = func.now() + timedelta(seconds=ttl_seconds)
+    locked_until = func.now() + timedelta(seconds=lease_seconds)
+    claimed = db.execute(
+        insert(IdempotencyKey).values(
+            key_hash=key_hash,
+            request_hash=request_hash,
+            expires_at=expires_at,
+            locked_until=locked_until
+        ).on_conflict_do_nothing().returning(IdempotencyKey.locked_until)
+    ).first()
+    if claimed is None:
+        claimed = db.execute(
+            update(IdempotencyKey).where(
+                IdempotencyKey.key_hash == key_hash,
+                or_(
+                    IdempotencyKey.expires_at < func.now(),
+                    and_(
+                        IdempotencyKey.status_code.is_(None),
+                        IdempotencyKey.request_hash == request_hash,
+                        or_(IdempotencyKey.locked_until.is_(None), IdempotencyKey.locked_until < func.now())
+                    )
+                )
+            ).values(
+                request_hash=request_hash,
+                status_code=None,
+                response_body=None,
+                created_at=func.now(),
+                expires_at=expires_at,
+                locked_until=locked_until
+            ).returning(IdempotencyKey.locked_until)
+        ).first()
+    if claimed is not None:
+        db.commit()
+        return {"claimed": True, "locked_until": claimed.locked_until}
+    
+    existing = db.execute(
+        select(
+            IdempotencyKey.request_hash,
+            IdempotencyKey.status_code,
+            IdempotencyKey.response_body
+        ).where(IdempotencyKey.key_hash == key_hash)
+    ).first()
+    db.commit()
+    if existing is None:
+        # Released between the two statements; the caller simply tries again.
+        return {"claimed": False, "request_hash": request_hash, "status_code": None, "response_body": None}
+    return {"claimed": False, **existing._asdict()}
+
+def complete_idempotency_key(db: Session, key_hash: bytes, locked_until, status_code: int, response_body) -> bool:
+    """Store the response for a claimed key in the caller's transaction.
+
+    Returns False if the lease ran out and the key was taken over by another request.
+    """
+    result = db.execute(
+        update(IdempotencyKey).where(
+            IdempotencyKey.key_hash == key_hash,
+            IdempotencyKey.locked_until == locked_until,
+            IdempotencyKey.status_code.is_(None)
+        ).values(status_code=status_code, response_body=response_body)
+    )
+    return result.rowcount > 0
+
+def release_idempotency_key(db: Session, key_hash: bytes, locked_until) -> None:
+    """Drop a claimed key whose request failed so the client can retry it."""
+    db.execute(delete(IdempotencyKey).where(
+        IdempotencyKey.key_hash == key_hash,
+        IdempotencyKey.locked_until == locked_until,
+        IdempotencyKey.status_code.is_(None)
+    ))
+    db.commit()
+
+def purge_expired_idempotency_keys(db: Session) -> int:
+    """Delete expired keys."""
+    result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at < func.now()))
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,118 @@
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models import Job, JobStatus
+
+def enqueue_job(
+    db: Session,
+    kind: str,
+    payload: Optional[dict] = None,
+    run_at: Optional[datetime] = None,
+    max_attempts: Optional[int] = None,
+    commit: bool = True
+) -> Job:
+    """Add a job to the queue.
+
+    With commit=False the job is only added to the caller's transaction, so
+    it is queued if and only if the caller's writes commit.
+    """
+    db_job = Job(
+        kind=kind,
+        payload=payload or {},
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS
+    )
+    if run_at is not None:
+        db_job.run_at = run_at
+    db.add(db_job)
+    if commit:
+        db.commit()
+        db.refresh(db_job)
+    return db_job
+
+def claim_job(db: Session) -> Optional[dict]:
+    """Claim the next due job, skipping rows other workers have locked."""
+    db_job = db.query(Job).filter(
+        Job.status == JobStatus.QUEUED,
+        Job.run_at <= func.now()
+    ).order_by(Job.run_at).with_for_update(skip_locked=True).first()
+
+    if not db_job:
+        db.rollback()
+        return None
+
+    claimed = {
+        "id": db_job.id,
+        "kind": db_job.kind,
+        "payload": db_job.payload,
+        "attempts": db_job.attempts + 1,
+        "max_attempts": db_job.max_attempts,
+    }
+    db_job.status = JobStatus.RUNNING
+    db_job.attempts = claimed["attempts"]
+    db_job.locked_at = func.now()
+    db.commit()
+    return claimed
+
+def complete_job(db: Session, job_id: int) -> None:
+    """Mark a job as done."""
+    db.execute(
+        update(Job).where(Job.id == job_id).values(
+            status=JobStatus.DONE, finished_at=func.now(), last_error=None
+        )
+    )
+    db.commit()
+
+def renew_job_lease(db: Session, job_id: int) -> bool:
+    """Push back a running job's lease. Returns False if the job is no longer running."""
+    result = db.execute(
+        update(Job).where(Job.id == job_id, Job.status == JobStatus.RUNNING).values(locked_at=func.now())
+    )
+    db.commit()
+    return result.rowcount > 0
+
+def backoff_delay(attempts: int) -> timedelta:
+    """Exponential backoff with jitter for the given attempt number."""
+    delay = min(settings.JOB_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), settings.JOB_BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+def fail_job(db: Session, job_id: int, attempts: int, max_attempts: int, error: str) -> bool:
+    """Record a failed attempt. Returns True if the job will be retried."""
+    retry = attempts < max_attempts
+    values = {"last_error": error[:4000], "locked_at": None}
+    if retry:
+        values.update(status=JobStatus.QUEUED, run_at=datetime.now(timezone.utc) + backoff_delay(attempts))
+    else:
+        values.update(status=JobStatus.FAILED, finished_at=func.now())
+    db.execute(update(Job).where(Job.id == job_id).values(**values))
+    db.commit()
+    return retry
+
+def requeue_stale_jobs(db: Session) -> int:
+    """Return jobs whose worker died mid-run to the queue."""
+    result = db.execute(
+        update(Job).where(
+            Job.status == JobStatus.RUNNING,
+            Job.locked_at < func.now() - timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        ).values(status=JobStatus.QUEUED, locked_at=None, run_at=func.now())
+    )
+    db.commit()
+    return result.rowcount
+
+def purge_finished_jobs(db: Session) -> int:
+    """Delete finished jobs older than the retention period."""
+    result = db.execute(
+        delete(Job).where(
+            Job.status.in_([JobStatus.DONE, JobStatus.FAILED]),
+            Job.finished_at < func.now() - timedelta(days=settings.JOB_RETENTION_DAYS)
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+def get_job_counts(db: Session) -> Dict[str, int]:
+    """Count jobs per status."""
+    rows = db.execute(select(Job.status, func.count()).group_by(Job.status))
+    return {status.value: count for status, count in rows}
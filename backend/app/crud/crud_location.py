@@ -1,4 +1,5 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
 from app.db.models import Region, District, Council
 
@@ -24,4 +25,22 @@ def get_councils(db: Session, district_id: Optional[int] = None) -> List[Council
     if district_id:
         query = query.filter(Council.district_id == district_id)
     
-    return query.order_by(Council.name).all()
\ No newline at end of file
+    return query.order_by(Council.name).all()
+
+def iter_location_names(db: Session) -> Iterator[Tuple[str, int, str, Optional[str]]]:
+    """Yield (kind, id, name, parent name) for every region, district and council."""
+    for region in db.query(Region.id, Region.name):
+        yield "region", region.id, region.name, None
+    
+    for district in db.query(District.id, District.name, Region.name.label("parent")).outerjoin(District.region):
+        yield "district", district.id, district.name, district.parent
+    
+    for council in db.query(Council.id, Council.name, District.name.label("parent")).outerjoin(Council.district):
+        yield "council", council.id, council.name, council.parent
+
+def find_council_id(db: Session, lon: float, lat: float) -> Optional[int]:
+    """Get the id of the council whose boundary contains a point, using the boundary GIST index."""
+    point = func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326)
+    return db.query(Council.id).filter(
+        func.ST_Covers(Council.geom, point)
+    ).order_by(Council.id).limit(1).scalar()
@@ -1,5 +1,10 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterator, List, Optional
+from uuid import UUID
+from sqlalchemy import any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PGUUID
 from sqlalchemy.orm import Session, joinedload
+from app.core.config import settings
 from app.db.models import Order, User, Plot
 from app.schemas.order import OrderCreate, OrderUpdate
 
@@ -10,6 +15,19 @@ def get_order(db: Session, order_id: str) -> Optional[Order]:
         joinedload(Order.plot)
     ).filter(Order.id == order_id).first()
 
+def get_orders_by_ids(db: Session, order_ids: List[UUID], user_id: Optional[str] = None) -> List[Order]:
+    """Get orders by a list of IDs in one ``id = ANY(...)`` query, optionally limited to one user's orders."""
+    if not order_ids:
+        return []
+    query = db.query(Order).filter(
+        Order.id == any_(bindparam("order_ids", order_ids, type_=ARRAY(PGUUID(as_uuid=True))))
+    )
+    
+    if user_id:
+        query = query.filter(Order.user_id == user_id)
+    
+    return query.all()
+
 def get_orders(db: Session, user_id: Optional[str] = None, skip: int = 0, limit: int = 100) -> List[Order]:
     """Get orders with optional user filter."""
     query = db.query(Order).options(
@@ -22,19 +40,61 @@ def get_orders(db: Session, user_id: Optional[str] = None, skip: int = 0, limit:
     
     return query.offset(skip).limit(limit).all()
 
-def create_order(db: Session, order: OrderCreate, user_id: str) -> Order:
-    """Create new order."""
+def iter_order_export_rows(
+    db: Session,
+    user_id: Optional[str] = None,
+    order_status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> Iterator[dict]:
+    """Stream flat order rows for export using a server-side cursor."""
+    query = db.query(
+        Order.id,
+        Order.order_status,
+        Order.created_at,
+        Order.user_id,
+        User.email.label("user_email"),
+        Order.plot_id,
+        Plot.plot_number,
+        Plot.title.label("plot_title"),
+        Plot.price.label("plot_price"),
+    ).join(Order.user).join(Order.plot)
+    
+    if user_id:
+        query = query.filter(Order.user_id == user_id)
+    
+    if order_status:
+        query = query.filter(Order.order_status == order_status)
+    
+    if created_from:
+        query = query.filter(Order.created_at >= created_from)
+    
+    if created_to:
+        query = query.filter(Order.created_at < created_to)
+    
+    query = query.order_by(Order.created_at, Order.id)
+    for row in query.execution_options(stream_results=True, yield_per=settings.EXPORT_BATCH_SIZE):
+        yield row._asdict()
+
+def _commit(db: Session, db_order: Order, commit: bool) -> None:
+    """Flush and refresh the order, committing the transaction only when asked."""
+    db.flush()
+    if commit:
+        db.commit()
+    db.refresh(db_order)
+
+def create_order(db: Session, order: OrderCreate, user_id: str, commit: bool = True) -> Order:
+    """Create new order. With commit=False it is only flushed into the caller's transaction."""
     db_order = Order(
         user_id=user_id,
         plot_id=order.plot_id,
         order_status="pending"
     )
     db.add(db_order)
-    db.commit()
-    db.refresh(db_order)
+    _commit(db, db_order, commit)
     return db_order
 
-def update_order(db: Session, order_id: str, order_update: OrderUpdate) -> Optional[Order]:
+def update_order(db: Session, order_id: str, order_update: OrderUpdate, commit: bool = True) -> Optional[Order]:
     """Update order."""
     db_order = get_order(db, order_id)
     if not db_order:
@@ -44,8 +104,7 @@ def update_order(db: Session, order_id: str, order_update: OrderUpdate) -> Optio
     for field, value in update_data.items():
         setattr(db_order, field, value)
     
-    db.commit()
-    db.refresh(db_order)
+    _commit(db, db_order, commit)
     return db_order
 
 def delete_order(db: Session, order_id: str) -> bool:
@@ -1,28 +1,64 @@
-from typing import List, Optional
+import math
+from typing import Iterator, List, Optional, Tuple
+from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, any_, bindparam, cast, func, select, true
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PGUUID
+from geoalchemy2 import Geography
+from geoalchemy2.shape import to_shape
+from app.core.config import settings
+from app.core.events import PlotChange, record_plot_change, PLOT_CREATED, PLOT_UPDATED, PLOT_DELETED
+from app.core.geometry import PlotOverlapError, prepare_polygon, derive_geometry_fields, price_per_sqm
+from app.crud.crud_location import find_council_id
 from app.db.models import Plot, Council, District, Region, PlotStatus
 from app.schemas.plot import PlotCreate, PlotUpdate, PlotSearch
 
+# Advisory lock namespace for plot geometry writes. Overlap checks lock the
+# PLOT_LOCK_CELL_DEGREES grid cells a plot's bounding box touches, so only
+# writes in the same area wait for each other. Plots spanning more than
+# PLOT_LOCK_MAX_CELLS cells lock the whole namespace instead.
+PLOT_GEOMETRY_LOCK = 720_042
+PLOT_GEOMETRY_LOCK_ALL = -1
+PLOT_LOCK_CELL_DEGREES = 0.01
+PLOT_LOCK_MAX_CELLS = 16
+
+# How many KNN candidates to fetch per requested result when re-ranking.
+SIMILAR_RERANK_FACTOR = 5
+
+# Sort options for plot searches. Each has a matching (status, column) index.
+PLOT_SORTS = {
+    "newest": (Plot.created_at.desc(), Plot.id.desc()),
+    "oldest": (Plot.created_at.asc(), Plot.id.asc()),
+    "price_asc": (Plot.price.asc(), Plot.id.asc()),
+    "price_desc": (Plot.price.desc(), Plot.id.desc()),
+    "price_per_sqm_asc": (Plot.price_per_sqm.asc(), Plot.id.asc()),
+    "price_per_sqm_desc": (Plot.price_per_sqm.desc(), Plot.id.desc()),
+    "area_asc": (Plot.area_sqm.asc(), Plot.id.asc()),
+    "area_desc": (Plot.area_sqm.desc(), Plot.id.desc()),
+}
+
 def get_plot(db: Session, plot_id: str) -> Optional[Plot]:
     """Get plot by ID with location details."""
     return db.query(Plot).options(
         joinedload(Plot.council).joinedload(Council.district).joinedload(District.region)
     ).filter(Plot.id == plot_id).first()
 
+def get_plots_by_ids(db: Session, plot_ids: List[UUID]) -> List[Plot]:
+    """Get plots by a list of IDs in one ``id = ANY(...)`` query, in no particular order."""
+    if not plot_ids:
+        return []
+    return db.query(Plot).options(
+        joinedload(Plot.council).joinedload(Council.district).joinedload(District.region)
+    ).filter(Plot.id == any_(bindparam("plot_ids", plot_ids, type_=ARRAY(PGUUID(as_uuid=True))))).all()
+
 def get_plots(db: Session, skip: int = 0, limit: int = 100) -> List[Plot]:
     """Get all plots with pagination."""
     return db.query(Plot).options(
         joinedload(Plot.council).joinedload(Council.district).joinedload(District.region)
     ).offset(skip).limit(limit).all()
 
-def search_plots(db: Session, search_params: PlotSearch, skip: int = 0, limit: int = 100) -> List[Plot]:
-    """Search plots with filters."""
-    query = db.query(Plot).options(
-        joinedload(Plot.council).joinedload(Council.district).joinedload(District.region)
-    )
-    
-    # Apply filters
+def apply_search_filters(query, search_params: PlotSearch):
+    """Apply PlotSearch filters to a query over plots."""
     if search_params.search:
         search_term = f"%{search_params.search}%"
         query = query.filter(
@@ -44,12 +80,18 @@ def search_plots(db: Session, search_params: PlotSearch, skip: int = 0, limit: i
     if search_params.max_area is not None:
         query = query.filter(Plot.area_sqm <= search_params.max_area)
     
+    # District and region filters are semi-joins on council ids so the same
+    # filters can be applied to queries that already join the location tables.
     if search_params.council_id:
         query = query.filter(Plot.council_id == search_params.council_id)
     elif search_params.district_id:
-        query = query.join(Council).filter(Council.district_id == search_params.district_id)
+        query = query.filter(Plot.council_id.in_(
+            select(Council.id).where(Council.district_id == search_params.district_id)
+        ))
     elif search_params.region_id:
-        query = query.join(Council).join(District).filter(District.region_id == search_params.region_id)
+        query = query.filter(Plot.council_id.in_(
+            select(Council.id).join(District).where(District.region_id == search_params.region_id)
+        ))
     
     if search_params.usage_type:
         query = query.filter(Plot.usage_type == search_params.usage_type)
@@ -57,50 +99,403 @@ def search_plots(db: Session, search_params: PlotSearch, skip: int = 0, limit: i
     if search_params.status:
         query = query.filter(Plot.status == search_params.status)
     
+    return query
+
+def build_search_query(db: Session, search_params: PlotSearch):
+    """Build the filtered, sorted plot search query with location details."""
+    query = db.query(Plot).options(
+        joinedload(Plot.council).joinedload(Council.district).joinedload(District.region)
+    )
+    query = apply_search_filters(query, search_params)
+    return query.order_by(*PLOT_SORTS.get(search_params.sort or "newest", PLOT_SORTS["newest"]))
+
+def search_plots(db: Session, search_params: PlotSearch, skip: int = 0, limit: int = 100) -> List[Plot]:
+    """Search plots with filters."""
+    return build_search_query(db, search_params).offset(skip).limit(limit).all()
+
+def get_plot_points(db: Session, search_params: PlotSearch, skip: int = 0, limit: int = 100) -> List[Tuple]:
+    """Search plots, returning only (id, centroid_lon, centroid_lat, price, status) rows for maps."""
+    query = db.query(Plot.id, Plot.centroid_lon, Plot.centroid_lat, Plot.price, Plot.status)
+    query = apply_search_filters(query, search_params)
+    query = query.order_by(*PLOT_SORTS.get(search_params.sort or "newest", PLOT_SORTS["newest"]))
     return query.offset(skip).limit(limit).all()
 
-def create_plot(db: Session, plot: PlotCreate, user_id: str) -> Plot:
-    """Create new plot."""
+def iter_plot_export_rows(db: Session, search_params: PlotSearch, with_geometry: bool = False) -> Iterator[dict]:
+    """Stream flat plot rows for export using a server-side cursor."""
+    columns = [
+        Plot.id,
+        Plot.plot_number,
+        Plot.title,
+        Plot.area_sqm,
+        Plot.price,
+        Plot.usage_type,
+        Plot.status,
+        Plot.council_id,
+        Council.name.label("council"),
+        District.name.label("district"),
+        Region.name.label("region"),
+        Plot.uploaded_by_id,
+        Plot.created_at,
+    ]
+    if with_geometry:
+        columns.append(func.ST_AsGeoJSON(Plot.geom).label("geometry"))
+    
+    query = db.query(*columns).outerjoin(Plot.council).outerjoin(Council.district).outerjoin(District.region)
+    query = apply_search_filters(query, search_params).order_by(Plot.created_at, Plot.id)
+    
+    result = query.execution_options(stream_results=True, yield_per=settings.EXPORT_BATCH_SIZE)
+    for row in result:
+        yield row._asdict()
+
+def plot_snapshot(plot: Plot) -> dict:
+    """Capture the plot fields that change listeners need, independent of the session."""
+    centroid = None
+    bounds = None
+    if plot.centroid_lon is not None:
+        centroid = (plot.centroid_lon, plot.centroid_lat)
+        bounds = (plot.bbox_min_lon, plot.bbox_min_lat, plot.bbox_max_lon, plot.bbox_max_lat)
+    elif plot.geom is not None:
+        # Rows written before derived columns existed
+        shape = to_shape(plot.geom)
+        centroid = (shape.centroid.x, shape.centroid.y)
+        bounds = shape.bounds
+    return {
+        "id": str(plot.id),
+        "plot_number": plot.plot_number,
+        "title": plot.title,
+        "description": plot.description,
+        "area_sqm": plot.area_sqm,
+        "price": plot.price,
+        "price_per_sqm": plot.price_per_sqm,
+        "usage_type": plot.usage_type,
+        "status": plot.status,
+        "council_id": plot.council_id,
+        "district_id": plot.council.district_id if plot.council else None,
+        "region_id": plot.council.district.region_id if plot.council and plot.council.district else None,
+        "image_urls": list(plot.image_urls or []),
+        "uploaded_by_id": str(plot.uploaded_by_id) if plot.uploaded_by_id else None,
+        "created_at": plot.created_at,
+        "centroid": centroid,
+        "bounds": bounds,
+    }
+
+def get_similar_plots(
+    db: Session, plot: Plot, k: int = 10, rerank: bool = False
+) -> Tuple[List[Tuple[Plot, float]], float]:
+    """Get the nearest available plots to a plot with their distance in metres.
+
+    Candidates come from a KNN scan (``geom <-> target``) on the GIST index.
+    With ``rerank`` the candidates are restricted to the same usage type and
+    reordered by distance rank, price-per-sqm and area similarity.
+
+    Also returns the search radius in metres: the distance of the farthest
+    candidate considered, or infinity when fewer candidates than requested
+    exist. Only plot changes inside that radius can change the result.
+    """
+    if plot.geom is None:
+        return [], math.inf
+    
+    knn_distance = Plot.geom.op("<->")(plot.geom)
+    distance_m = func.ST_Distance(cast(Plot.geom, Geography), cast(plot.geom, Geography))
+    query = db.query(Plot, distance_m.label("distance_m")).options(
+        joinedload(Plot.council).joinedload(Council.district).joinedload(District.region)
+    ).filter(
+        Plot.id != plot.id,
+        Plot.status == PlotStatus.AVAILABLE,
+        Plot.geom.isnot(None)
+    )
+    
+    if rerank and plot.usage_type:
+        query = query.filter(Plot.usage_type == plot.usage_type)
+    limit = k * SIMILAR_RERANK_FACTOR if rerank else k
+    candidates = [(row[0], row[1]) for row in query.order_by(knn_distance).limit(limit).all()]
+    radius = max(distance for _, distance in candidates) if len(candidates) == limit else math.inf
+    
+    if not rerank:
+        return candidates, radius
+    
+    def log_ratio(value, target) -> float:
+        if not value or not target:
+            return 1.0
+        return abs(math.log(float(value) / float(target)))
+    
+    target_ppsqm = plot.price_per_sqm or price_per_sqm(plot.price, plot.area_sqm)
+    scored = []
+    for rank, (candidate, distance) in enumerate(candidates):
+        ppsqm = candidate.price_per_sqm or price_per_sqm(candidate.price, candidate.area_sqm)
+        score = (
+            rank / len(candidates)
+            + log_ratio(ppsqm, target_ppsqm)
+            + log_ratio(candidate.area_sqm, plot.area_sqm)
+        )
+        scored.append((score, rank, candidate, distance))
+    scored.sort(key=lambda item: (item[0], item[1]))
+    
+    return [(candidate, distance) for _, _, candidate, distance in scored[:k]], radius
+
+def get_plot_clusters(
+    db: Session,
+    bounds: Tuple[float, float, float, float],
+    cell_size: float,
+    status: Optional[PlotStatus] = None
+) -> List[dict]:
+    """Grid-cluster plot centroids inside bounds.
+
+    Centroids are snapped to the centre of their grid cell with
+    ST_SnapToGrid, with the grid anchored at the lower-left corner of bounds
+    so cells never straddle tiles.
+    """
+    min_lon, min_lat, max_lon, max_lat = bounds
+    cell = func.ST_SnapToGrid(
+        Plot.centroid, min_lon + cell_size / 2, min_lat + cell_size / 2, cell_size, cell_size
+    )
+    query = db.query(
+        func.count().label("count"),
+        func.avg(Plot.centroid_lon).label("lon"),
+        func.avg(Plot.centroid_lat).label("lat"),
+        func.min(Plot.price).label("min_price"),
+        func.max(Plot.price).label("max_price"),
+        (func.array_agg(Plot.id))[1].label("first_id"),
+        *[func.count().filter(Plot.status == value).label(value.value) for value in PlotStatus]
+    ).filter(
+        Plot.centroid.intersects(func.ST_MakeEnvelope(min_lon, min_lat, max_lon, max_lat, 4326)),
+        # Half-open bounds so plots on a tile edge belong to exactly one tile
+        Plot.centroid_lon >= min_lon,
+        Plot.centroid_lon < max_lon,
+        Plot.centroid_lat >= min_lat,
+        Plot.centroid_lat < max_lat
+    )
+    
+    if status:
+        query = query.filter(Plot.status == status)
+    
+    clusters = []
+    for row in query.group_by(cell).all():
+        clusters.append({
+            "lon": row.lon,
+            "lat": row.lat,
+            "count": row.count,
+            "min_price": row.min_price,
+            "max_price": row.max_price,
+            "plot_id": row.first_id if row.count == 1 else None,
+            "statuses": {value.value: getattr(row, value.value) for value in PlotStatus if getattr(row, value.value)},
+        })
+    return clusters
+
+def build_latest_query(db: Session, limit: int):
+    """Build the query for the newest available plots."""
+    return db.query(Plot).filter(
+        Plot.status == PlotStatus.AVAILABLE
+    ).order_by(*PLOT_SORTS["newest"]).limit(limit)
+
+def get_latest_plots(db: Session, limit: int) -> List[Plot]:
+    """Get the newest available plots."""
+    return build_latest_query(db, limit).all()
+
+def build_featured_query(db: Session, per_region: int, region_ids: Optional[List[int]] = None):
+    """Build the query for the newest available plots with images per region, with their region id."""
+    regions = select(Region.id.label("region_id"))
+    if region_ids is not None:
+        regions = regions.where(Region.id.in_(region_ids))
+    regions = regions.subquery("feed_regions")
+    
+    # One LATERAL top-N per region: each walks ix_plots_status_created_at
+    # newest first and stops after per_region plots instead of ranking them all.
+    newest = select(Plot.id.label("plot_id")).where(
+        Plot.status == PlotStatus.AVAILABLE,
+        func.cardinality(Plot.image_urls) > 0,
+        Plot.council_id.in_(
+            select(Council.id).join(District).where(
+                District.region_id == regions.c.region_id
+            ).correlate(regions)
+        )
+    ).order_by(*PLOT_SORTS["newest"]).limit(per_region).lateral("newest")
+    
+    return db.query(Plot, regions.c.region_id).select_from(regions).join(
+        newest, true()
+    ).join(Plot, Plot.id == newest.c.plot_id)
+
+def get_featured_plots(
+    db: Session, per_region: int, region_ids: Optional[List[int]] = None
+) -> List[Tuple[Plot, int]]:
+    """Get the newest available plots with images in each region (or the given ones), with their region id."""
+    return build_featured_query(db, per_region, region_ids).all()
+
+def iter_plot_numbers(db: Session) -> Iterator[Tuple[str, str, str]]:
+    """Stream (id, plot_number, title) for plots that have a plot number."""
+    query = db.query(Plot.id, Plot.plot_number, Plot.title).filter(Plot.plot_number.isnot(None))
+    for row in query.execution_options(stream_results=True, yield_per=settings.EXPORT_BATCH_SIZE):
+        yield str(row.id), row.plot_number, row.title
+
+def apply_plot_geometry(db_plot: Plot, geometry: Optional[dict]) -> None:
+    """Validate a GeoJSON polygon and store it with its derived columns.
+
+    Raises GeometryError if the polygon cannot be used.
+    """
+    if geometry is None:
+        return
+    for field, value in derive_geometry_fields(prepare_polygon(geometry)).items():
+        setattr(db_plot, field, value)
+
+def _sphere_area(geom, stored_area=None):
+    # Same spherical model as geom_area_sqm (ST_Area with use_spheroid false).
+    area = func.ST_Area(cast(geom, Geography(srid=4326)), False)
+    return area if stored_area is None else func.coalesce(stored_area, area)
+
+def overlap_ratio(geom_a, geom_b, area_a=None, area_b=None):
+    """Geodesic intersection area as a share of the smaller polygon's area.
+
+    area_a and area_b are the polygons' stored geom_area_sqm, if known.
+    """
+    return _sphere_area(func.ST_Intersection(geom_a, geom_b)) / func.nullif(
+        func.least(_sphere_area(geom_a, area_a), _sphere_area(geom_b, area_b)), 0
+    )
+
+def find_overlapping_plots(
+    db: Session,
+    geom,
+    exclude_id: Optional[UUID] = None,
+    max_ratio: Optional[float] = None,
+    area_sqm=None
+) -> List[Tuple[str, Optional[str], float]]:
+    """Get (id, plot_number, overlap ratio) of plots overlapping geom by more than max_ratio."""
+    max_ratio = settings.PLOT_OVERLAP_MAX_RATIO if max_ratio is None else max_ratio
+    ratio = overlap_ratio(Plot.geom, geom, Plot.geom_area_sqm, area_sqm)
+    query = db.query(Plot.id, Plot.plot_number, ratio.label("ratio")).filter(
+        func.ST_Intersects(Plot.geom, geom),
+        ratio > max_ratio
+    )
+    if exclude_id is not None:
+        query = query.filter(Plot.id != exclude_id)
+    return [(str(row.id), row.plot_number, float(row.ratio)) for row in query.order_by(ratio.desc())]
+
+def plot_lock_cells(bounds: Tuple[float, float, float, float]) -> Optional[List[int]]:
+    """Advisory lock keys of the grid cells a bounding box touches, or None if there are too many."""
+    # Cells per 180 degrees: x runs over 2 * columns cells and y over columns,
+    # and the last cell also takes lon 180 and lat 90.
+    columns = round(180 / PLOT_LOCK_CELL_DEGREES)
+    
+    def cell(value: float, half_cells: int) -> int:
+        return min(math.floor(value / PLOT_LOCK_CELL_DEGREES), half_cells - 1)
+    
+    min_lon, min_lat, max_lon, max_lat = bounds
+    xs = range(cell(min_lon, columns), cell(max_lon, columns) + 1)
+    ys = range(cell(min_lat, columns // 2), cell(max_lat, columns // 2) + 1)
+    if len(xs) * len(ys) > PLOT_LOCK_MAX_CELLS:
+        return None
+    # Offset to non-negative cell indexes; keys are below 2 * columns**2, which fits in an int4.
+    return sorted((x + columns) * columns + (y + columns // 2) for x in xs for y in ys)
+
+def check_plot_overlaps(db: Session, db_plot: Plot) -> None:
+    """Raise PlotOverlapError if the plot's polygon overlaps existing plots.
+
+    Takes transaction-level locks on the plot's grid cells so concurrent
+    writes to the same area cannot both pass the check; they are released
+    when the caller commits or rolls back. Cells are locked in sorted order,
+    under a shared lock on the whole namespace.
+    """
+    if db_plot.geom is None:
+        return
+    bounds = (db_plot.bbox_min_lon, db_plot.bbox_min_lat, db_plot.bbox_max_lon, db_plot.bbox_max_lat)
+    cells = plot_lock_cells(bounds)
+    if cells is None:
+        db.execute(select(func.pg_advisory_xact_lock(PLOT_GEOMETRY_LOCK, PLOT_GEOMETRY_LOCK_ALL)))
+    else:
+        db.execute(select(func.pg_advisory_xact_lock_shared(PLOT_GEOMETRY_LOCK, PLOT_GEOMETRY_LOCK_ALL)))
+        for cell in cells:
+            db.execute(select(func.pg_advisory_xact_lock(PLOT_GEOMETRY_LOCK, cell)))
+    overlaps = find_overlapping_plots(db, db_plot.geom, exclude_id=db_plot.id, area_sqm=db_plot.geom_area_sqm)
+    if overlaps:
+        raise PlotOverlapError(overlaps)
+
+def assign_council(db: Session, db_plot: Plot) -> None:
+    """Set the plot's council to the one whose boundary contains its centroid, if any."""
+    if db_plot.centroid_lon is None:
+        return
+    council_id = find_council_id(db, db_plot.centroid_lon, db_plot.centroid_lat)
+    if council_id is not None:
+        db_plot.council_id = council_id
+
+def _commit(db: Session, db_plot: Plot, commit: bool) -> None:
+    """Flush and refresh the plot, committing the transaction only when asked."""
+    # Plot change listeners run when the transaction commits (see app.core.events).
+    db.flush()
+    if commit:
+        db.commit()
+    db.refresh(db_plot)
+
+def create_plot(db: Session, plot: PlotCreate, user_id: str, commit: bool = True) -> Plot:
+    """Create new plot. With commit=False it is only flushed into the caller's transaction."""
     db_plot = Plot(
-        **plot.dict(),
+        **plot.dict(exclude={"geometry"}),
         uploaded_by_id=user_id
     )
+    apply_plot_geometry(db_plot, plot.geometry)
+    check_plot_overlaps(db, db_plot)
+    # An explicitly chosen council is kept; otherwise it follows the geometry
+    if plot.council_id is None:
+        assign_council(db, db_plot)
+    if db_plot.area_sqm is None:
+        db_plot.area_sqm = db_plot.geom_area_sqm
+    db_plot.price_per_sqm = price_per_sqm(db_plot.price, db_plot.area_sqm)
     db.add(db_plot)
-    db.commit()
+    db.flush()
     db.refresh(db_plot)
+    record_plot_change(db, PlotChange(PLOT_CREATED, str(db_plot.id), after=plot_snapshot(db_plot)))
+    _commit(db, db_plot, commit)
     return db_plot
 
-def update_plot(db: Session, plot_id: str, plot_update: PlotUpdate) -> Optional[Plot]:
+def update_plot(db: Session, plot_id: str, plot_update: PlotUpdate, commit: bool = True) -> Optional[Plot]:
     """Update plot."""
     db_plot = get_plot(db, plot_id)
     if not db_plot:
         return None
     
+    before = plot_snapshot(db_plot)
     update_data = plot_update.dict(exclude_unset=True)
+    geometry = update_data.pop("geometry", None)
+    apply_plot_geometry(db_plot, geometry)
+    if geometry is not None:
+        check_plot_overlaps(db, db_plot)
+        if "council_id" not in update_data:
+            assign_council(db, db_plot)
+        # As on create, the area follows the polygon unless it is given explicitly
+        if update_data.get("area_sqm") is None:
+            update_data.pop("area_sqm", None)
+            db_plot.area_sqm = db_plot.geom_area_sqm
     for field, value in update_data.items():
         setattr(db_plot, field, value)
+    db_plot.price_per_sqm = price_per_sqm(db_plot.price, db_plot.area_sqm)
     
-    db.commit()
+    db.flush()
     db.refresh(db_plot)
+    record_plot_change(db, PlotChange(PLOT_UPDATED, before["id"], before=before, after=plot_snapshot(db_plot)))
+    _commit(db, db_plot, commit)
     return db_plot
 
-def update_plot_status(db: Session, plot_id: str, status: PlotStatus) -> Optional[Plot]:
+def update_plot_status(db: Session, plot_id: str, status: PlotStatus, commit: bool = True) -> Optional[Plot]:
     """Update plot status."""
     db_plot = get_plot(db, plot_id)
     if not db_plot:
         return None
     
+    before = plot_snapshot(db_plot)
     db_plot.status = status
-    db.commit()
-    db.refresh(db_plot)
+    db.flush()
+    record_plot_change(db, PlotChange(PLOT_UPDATED, before["id"], before=before, after=plot_snapshot(db_plot)))
+    _commit(db, db_plot, commit)
     return db_plot
 
-def delete_plot(db: Session, plot_id: str) -> bool:
+def delete_plot(db: Session, plot_id: str, commit: bool = True) -> bool:
     """Delete plot."""
     db_plot = get_plot(db, plot_id)
     if not db_plot:
         return False
     
+    before = plot_snapshot(db_plot)
     db.delete(db_plot)
-    db.commit()
+    db.flush()
+    record_plot_change(db, PlotChange(PLOT_DELETED, before["id"], before=before))
+    if commit:
+        db.commit()
     return True
\ No newline at end of file
@@ -0,0 +1,61 @@
+from typing import Iterator, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import any_, bindparam, func, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PGUUID
+from sqlalchemy.orm import Session, joinedload
+from app.db.models import SavedSearch
+from app.schemas.saved_search import SavedSearchCreate
+
+def get_saved_search(db: Session, search_id: str) -> Optional[SavedSearch]:
+    """Get saved search by ID."""
+    return db.query(SavedSearch).filter(SavedSearch.id == search_id).first()
+
+def get_saved_searches(db: Session, user_id: str) -> List[SavedSearch]:
+    """Get a user's saved searches."""
+    return db.query(SavedSearch).filter(
+        SavedSearch.user_id == user_id
+    ).order_by(SavedSearch.created_at).all()
+
+def get_saved_searches_by_ids(db: Session, search_ids: List[UUID]) -> List[SavedSearch]:
+    """Get saved searches with their users by a list of IDs."""
+    return db.query(SavedSearch).options(joinedload(SavedSearch.user)).filter(
+        SavedSearch.id == any_(bindparam("search_ids", search_ids, type_=ARRAY(PGUUID(as_uuid=True))))
+    ).all()
+
+def iter_notifying_searches(db: Session) -> Iterator[Tuple[str, str, dict]]:
+    """Stream (id, user_id, criteria) for searches with notifications on."""
+    query = db.query(SavedSearch.id, SavedSearch.user_id, SavedSearch.criteria).filter(SavedSearch.notify.is_(True))
+    for row in query.execution_options(stream_results=True, yield_per=1000):
+        yield str(row.id), str(row.user_id), row.criteria
+
+def create_saved_search(db: Session, saved_search: SavedSearchCreate, user_id: str) -> SavedSearch:
+    """Create new saved search."""
+    db_search = SavedSearch(
+        user_id=user_id,
+        name=saved_search.name,
+        criteria=saved_search.criteria.model_dump(mode="json", exclude_none=True),
+        notify=saved_search.notify
+    )
+    db.add(db_search)
+    db.commit()
+    db.refresh(db_search)
+    return db_search
+
+def mark_searches_notified(db: Session, search_ids: List[UUID]) -> None:
+    """Record that matches were sent for these searches."""
+    db.execute(
+        update(SavedSearch).where(
+            SavedSearch.id == any_(bindparam("search_ids", search_ids, type_=ARRAY(PGUUID(as_uuid=True))))
+        ).values(last_notified_at=func.now())
+    )
+    db.commit()
+
+def delete_saved_search(db: Session, search_id: str) -> bool:
+    """Delete saved search."""
+    db_search = get_saved_search(db, search_id)
+    if not db_search:
+        return False
+    
+    db.delete(db_search)
+    db.commit()
+    return True
@@ -0,0 +1,78 @@
+from datetime import timedelta
+from decimal import Decimal
+from typing import List
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.db.models import Order, Plot, Council, District, Region
+
+ORDER_WINDOWS = {
+    "last_24h": timedelta(hours=24),
+    "last_7d": timedelta(days=7),
+    "last_30d": timedelta(days=30),
+}
+
+COMPLETED = "completed"
+
+def get_order_status_counts(db: Session) -> List[dict]:
+    """Count orders per status, overall and within each recent window."""
+    query = select(
+        Order.order_status,
+        func.count().label("total"),
+        *[
+            func.count().filter(Order.created_at >= func.now() - window).label(name)
+            for name, window in ORDER_WINDOWS.items()
+        ]
+    ).group_by(Order.order_status).order_by(Order.order_status)
+    return [row._asdict() for row in db.execute(query)]
+
+def get_daily_order_counts(db: Session, days: int = 30) -> List[dict]:
+    """Count orders per status per day for the last ``days`` days."""
+    day = func.date_trunc("day", Order.created_at)
+    query = select(
+        func.date(day).label("day"),
+        Order.order_status,
+        func.count().label("count")
+    ).where(
+        Order.created_at >= func.now() - timedelta(days=days)
+    ).group_by(day, Order.order_status).order_by(day, Order.order_status)
+    return [row._asdict() for row in db.execute(query)]
+
+def get_plot_status_by_region(db: Session) -> List[dict]:
+    """Count plots per status in each region. Plots without a council have no region."""
+    query = select(
+        Region.id.label("region_id"),
+        Region.name.label("region"),
+        Plot.status,
+        func.count().label("count")
+    ).select_from(Plot).outerjoin(Council, Plot.council_id == Council.id).outerjoin(
+        District, Council.district_id == District.id
+    ).outerjoin(
+        Region, District.region_id == Region.id
+    ).group_by(Region.id, Region.name, Plot.status).order_by(Region.name, Plot.status)
+    return [row._asdict() for row in db.execute(query)]
+
+def get_completed_revenue(db: Session) -> dict:
+    """Sum plot prices of completed orders, overall and over the last 30 days."""
+    query = select(
+        func.coalesce(func.sum(Plot.price), 0).label("total"),
+        func.coalesce(
+            func.sum(Plot.price).filter(Order.created_at >= func.now() - ORDER_WINDOWS["last_30d"]), 0
+        ).label("last_30d")
+    ).select_from(Order).join(Plot, Order.plot_id == Plot.id).where(Order.order_status == COMPLETED)
+    row = db.execute(query).one()
+    return {"total": Decimal(row.total), "last_30d": Decimal(row.last_30d)}
+
+def get_top_councils(db: Session, limit: int = 10) -> List[dict]:
+    """Councils ranked by revenue from completed orders."""
+    revenue = func.sum(Plot.price)
+    query = select(
+        Council.id.label("council_id"),
+        Council.name.label("council"),
+        func.count(Order.id).label("completed_orders"),
+        revenue.label("revenue")
+    ).select_from(Order).join(Plot, Order.plot_id == Plot.id).join(
+        Council, Plot.council_id == Council.id
+    ).where(
+        Order.order_status == COMPLETED
+    ).group_by(Council.id, Council.name).order_by(revenue.desc()).limit(limit)
+    return [row._asdict() for row in db.execute(query)]
@@ -1,6 +1,7 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from sqlalchemy.orm import Session
-from app.db.models import User
+from app.core.config import settings
+from app.db.models import User, UserRole
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.security import get_password_hash
 
@@ -16,6 +17,26 @@ def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
     """Get all users with pagination."""
     return db.query(User).offset(skip).limit(limit).all()
 
+def iter_user_export_rows(db: Session, role: Optional[UserRole] = None) -> Iterator[dict]:
+    """Stream user rows for export using a server-side cursor."""
+    query = db.query(
+        User.id,
+        User.first_name,
+        User.last_name,
+        User.email,
+        User.phone_number,
+        User.role,
+        User.is_active,
+        User.created_at,
+    )
+    
+    if role:
+        query = query.filter(User.role == role)
+    
+    query = query.order_by(User.created_at, User.id)
+    for row in query.execution_options(stream_results=True, yield_per=settings.EXPORT_BATCH_SIZE):
+        yield row._asdict()
+
 def create_user(db: Session, user: UserCreate) -> User:
     """Create new user."""
     hashed_password = get_password_hash(user.password)
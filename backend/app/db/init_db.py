@@ -0,0 +1,33 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.db.models import Base
+from app.db.views import create_views
+
+def init_db(engine: Engine) -> None:
+    """Create tables, indexes and materialized views that are missing."""
+    with engine.begin() as connection:
+        # Trigram operator classes used by the plot text search indexes
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    
+    Base.metadata.create_all(bind=engine)
+    
+    with engine.begin() as connection:
+        # create_all skips tables that already exist, so nullable columns and
+        # indexes added to existing models are created here.
+        inspector = inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in columns and column.nullable:
+                    column_type = column.type.compile(dialect=connection.dialect)
+                    connection.execute(text(
+                        f'ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS "{column.name}" {column_type}'
+                    ))
+            
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(bind=connection)
+        
+        create_views(connection)
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, Integer, Numeric, Boolean, DateTime, Text, ForeignKey, Enum, ARRAY
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, Numeric, Float, Boolean, DateTime, Text, ForeignKey, Enum, ARRAY, Index, LargeBinary
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from geoalchemy2 import Geometry
 import uuid
@@ -21,6 +21,12 @@ class PlotStatus(str, enum.Enum):
     PENDING_PAYMENT = "pending_payment"
     SOLD = "sold"
 
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
 class User(Base):
     __tablename__ = "users"
     
@@ -37,12 +43,19 @@ class User(Base):
     # Relationships
     uploaded_plots = relationship("Plot", back_populates="uploaded_by")
     orders = relationship("Order", back_populates="user")
+    saved_searches = relationship("SavedSearch", back_populates="user", cascade="all, delete-orphan")
 
 class Region(Base):
     __tablename__ = "regions"
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), unique=True, nullable=False)
+    # Boundary; deferred so location joins don't load it
+    geom = deferred(Column(Geometry("MULTIPOLYGON", srid=4326, spatial_index=False)))
+    
+    __table_args__ = (
+        Index("ix_regions_geom", "geom", postgresql_using="gist"),
+    )
     
     # Relationships
     districts = relationship("District", back_populates="region")
@@ -52,7 +65,13 @@ class District(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
-    region_id = Column(Integer, ForeignKey("regions.id", ondelete="CASCADE"))
+    region_id = Column(Integer, ForeignKey("regions.id", ondelete="CASCADE"), index=True)
+    # Boundary; deferred so location joins don't load it
+    geom = deferred(Column(Geometry("MULTIPOLYGON", srid=4326, spatial_index=False)))
+    
+    __table_args__ = (
+        Index("ix_districts_geom", "geom", postgresql_using="gist"),
+    )
     
     # Relationships
     region = relationship("Region", back_populates="districts")
@@ -63,7 +82,13 @@ class Council(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
-    district_id = Column(Integer, ForeignKey("districts.id", ondelete="CASCADE"))
+    district_id = Column(Integer, ForeignKey("districts.id", ondelete="CASCADE"), index=True)
+    # Boundary; deferred so location joins don't load it
+    geom = deferred(Column(Geometry("MULTIPOLYGON", srid=4326, spatial_index=False)))
+    
+    __table_args__ = (
+        Index("ix_councils_geom", "geom", postgresql_using="gist"),
+    )
     
     # Relationships
     district = relationship("District", back_populates="councils")
@@ -86,6 +111,38 @@ class Plot(Base):
     uploaded_by_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    # Derived from geom and price on write (see app.core.geometry)
+    price_per_sqm = Column(Numeric(14, 2))
+    geom_area_sqm = Column(Numeric(14, 2))
+    centroid = Column(Geometry("POINT", srid=4326, spatial_index=False))
+    centroid_lon = Column(Float)
+    centroid_lat = Column(Float)
+    bbox_min_lon = Column(Float)
+    bbox_min_lat = Column(Float)
+    bbox_max_lon = Column(Float)
+    bbox_max_lat = Column(Float)
+    geom_simplified = Column(JSONB)
+    
+    __table_args__ = (
+        Index("ix_plots_council_id_status", "council_id", "status"),
+        Index("ix_plots_centroid", "centroid", postgresql_using="gist"),
+        Index("ix_plots_status_created_at", "status", "created_at"),
+        Index("ix_plots_status_price", "status", "price"),
+        Index("ix_plots_status_price_per_sqm", "status", "price_per_sqm"),
+        Index("ix_plots_status_area_sqm", "status", "area_sqm"),
+        # Sorts for listings across all statuses
+        Index("ix_plots_created_at", "created_at"),
+        Index("ix_plots_price", "price"),
+        Index("ix_plots_price_per_sqm", "price_per_sqm"),
+        Index("ix_plots_area_sqm", "area_sqm"),
+        # Trigram indexes for the ILIKE text search (requires pg_trgm)
+        Index("ix_plots_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index(
+            "ix_plots_description_trgm", "description",
+            postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}
+        ),
+    )
+    
     # Relationships
     council = relationship("Council", back_populates="plots")
     uploaded_by = relationship("User", back_populates="uploaded_plots")
@@ -100,6 +157,60 @@ class Order(Base):
     order_status = Column(String(50), default="pending")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        Index("ix_orders_order_status_created_at", "order_status", "created_at"),
+        Index("ix_orders_created_at", "created_at"),
+        Index("ix_orders_plot_id", "plot_id"),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="orders")
-    plot = relationship("Plot", back_populates="orders")
\ No newline at end of file
+    plot = relationship("Plot", back_populates="orders")
+
+class SavedSearch(Base):
+    __tablename__ = "saved_searches"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String(100), nullable=False)
+    criteria = Column(JSONB, nullable=False)
+    notify = Column(Boolean, default=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_notified_at = Column(DateTime(timezone=True))
+    
+    # Relationships
+    user = relationship("User", back_populates="saved_searches")
+
+class Job(Base):
+    __tablename__ = "jobs"
+    
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(100), nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+    status = Column(Enum(JobStatus), default=JobStatus.QUEUED, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=5, nullable=False)
+    run_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_at = Column(DateTime(timezone=True))
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True))
+    
+    __table_args__ = (
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    
+    # SHA-256 of the request scope and client key; status_code stays NULL
+    # while the first request is still running.
+    key_hash = Column(LargeBinary(32), primary_key=True)
+    request_hash = Column(LargeBinary(32), nullable=False)
+    status_code = Column(Integer)
+    response_body = Column(JSONB)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    # Lease of the request that claimed the key; once it passes with no
+    # status_code the request is presumed dead and the key can be reclaimed.
+    locked_until = Column(DateTime(timezone=True))
\ No newline at end of file
@@ -7,12 +7,24 @@ from app.core.config import settings
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
     echo=False  # Set to True for SQL debugging
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Job workers and scheduled tasks get their own small pool, so they never
+# take the connections admission control hands out to requests.
+background_engine = create_engine(
+    settings.DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=settings.BACKGROUND_DB_POOL_SIZE,
+    max_overflow=settings.BACKGROUND_DB_MAX_OVERFLOW
+)
+BackgroundSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=background_engine)
+
 # Create base class for models
 Base = declarative_base()
 
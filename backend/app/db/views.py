@@ -0,0 +1,72 @@
+from sqlalchemy import Column, Integer, MetaData, Numeric, String, Table, text
+from sqlalchemy.engine import Connection
+
+# Materialized views live in their own metadata so create_all never tries to
+# create them as plain tables.
+views_metadata = MetaData()
+
+plot_price_stats = Table(
+    "plot_price_stats",
+    views_metadata,
+    Column("level", String(10), primary_key=True),
+    Column("area_id", Integer, primary_key=True),
+    Column("area_name", String(100)),
+    Column("usage_type", String(100), primary_key=True),
+    Column("plot_count", Integer),
+    Column("p25", Numeric),
+    Column("median", Numeric),
+    Column("p75", Numeric),
+    Column("mean", Numeric),
+)
+
+# Price-per-sqm percentiles rolled up per council, district and region, both
+# across all usage types ('*') and per usage type.
+PLOT_PRICE_STATS_DDL = [
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS plot_price_stats AS
+    WITH priced AS (
+        SELECT p.council_id, c.district_id, d.region_id,
+               COALESCE(p.usage_type, '') AS usage_type,
+               p.price / p.area_sqm AS price_per_sqm
+        FROM plots p
+        JOIN councils c ON c.id = p.council_id
+        JOIN districts d ON d.id = c.district_id
+        WHERE p.area_sqm > 0
+    ),
+    stats AS (
+        SELECT
+            CASE WHEN GROUPING(council_id) = 0 THEN 'council'
+                 WHEN GROUPING(district_id) = 0 THEN 'district'
+                 ELSE 'region' END AS level,
+            COALESCE(council_id, district_id, region_id) AS area_id,
+            CASE WHEN GROUPING(usage_type) = 0 THEN usage_type ELSE '*' END AS usage_type,
+            count(*)::integer AS plot_count,
+            percentile_cont(0.25) WITHIN GROUP (ORDER BY price_per_sqm) AS p25,
+            percentile_cont(0.5) WITHIN GROUP (ORDER BY price_per_sqm) AS median,
+            percentile_cont(0.75) WITHIN GROUP (ORDER BY price_per_sqm) AS p75,
+            avg(price_per_sqm) AS mean
+        FROM priced
+        GROUP BY GROUPING SETS (
+            (region_id), (region_id, usage_type),
+            (district_id), (district_id, usage_type),
+            (council_id), (council_id, usage_type)
+        )
+    )
+    SELECT s.level, s.area_id, COALESCE(c.name, d.name, r.name) AS area_name,
+           s.usage_type, s.plot_count, s.p25, s.median, s.p75, s.mean
+    FROM stats s
+    LEFT JOIN councils c ON s.level = 'council' AND c.id = s.area_id
+    LEFT JOIN districts d ON s.level = 'district' AND d.id = s.area_id
+    LEFT JOIN regions r ON s.level = 'region' AND r.id = s.area_id
+    """,
+    # A plain unique index is required for REFRESH ... CONCURRENTLY.
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS ix_plot_price_stats_key
+    ON plot_price_stats (level, area_id, usage_type)
+    """,
+]
+
+def create_views(connection: Connection) -> None:
+    """Create materialized views that do not exist yet."""
+    for statement in PLOT_PRICE_STATS_DDL:
+        connection.execute(text(statement))
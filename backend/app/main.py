@@ -5,16 +5,20 @@ import uvicorn
 import os
 from dotenv import load_dotenv
 
-from app.api.endpoints import users, plots, orders, auth
+from app.api.endpoints import users, plots, orders, auth, analytics, admin, search, saved_searches, feeds
+from app.core.admission import AdmissionMiddleware, admission_controller
 from app.core.config import settings
+from app.core.jobs import start_job_workers, stop_job_workers
+from app.core.profiling import ProfilingMiddleware
+from app.core.scheduler import run_startup_tasks, start_scheduler, stop_scheduler
 from app.db.session import engine
-from app.db.models import Base
+from app.db.init_db import init_db
 
 # Load environment variables
 load_dotenv()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Create database tables, indexes and materialized views
+init_db(engine)
 
 app = FastAPI(
     title="Real Estate Platform API",
@@ -24,6 +28,15 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Shed load before requests queue on the database pool. Middleware added
+# last runs first, so CORS (added below) also covers shed responses.
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionMiddleware, controller=admission_controller)
+
+# Admin-triggered profiling of list endpoints
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -41,6 +54,26 @@ app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(users.router, prefix="/api/users", tags=["users"])
 app.include_router(plots.router, prefix="/api/plots", tags=["plots"])
 app.include_router(orders.router, prefix="/api/orders", tags=["orders"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
+app.include_router(search.router, prefix="/api/search", tags=["search"])
+app.include_router(saved_searches.router, prefix="/api/saved-searches", tags=["saved searches"])
+app.include_router(feeds.router, prefix="/api/feeds", tags=["feeds"])
+
+@app.on_event("startup")
+async def start_background_tasks():
+    if settings.SCHEDULER_ENABLED:
+        await start_scheduler()
+    else:
+        # In-memory indexes and feeds are still built once, just never refreshed.
+        await run_startup_tasks()
+    if settings.JOB_WORKERS_IN_APP > 0:
+        await start_job_workers(settings.JOB_WORKERS_IN_APP)
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    await stop_job_workers()
+    await stop_scheduler()
 
 @app.get("/")
 async def root():
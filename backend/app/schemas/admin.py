@@ -0,0 +1,67 @@
+from pydantic import BaseModel
+from typing import Optional, List, Dict
+from datetime import date, datetime
+from decimal import Decimal
+from app.db.models import PlotStatus
+
+class OrderStatusCount(BaseModel):
+    order_status: Optional[str] = None
+    total: int
+    last_24h: int
+    last_7d: int
+    last_30d: int
+
+class DailyOrderCount(BaseModel):
+    day: date
+    order_status: Optional[str] = None
+    count: int
+
+class RegionPlotCount(BaseModel):
+    region_id: Optional[int] = None
+    region: Optional[str] = None
+    status: PlotStatus
+    count: int
+
+class Revenue(BaseModel):
+    total: Decimal
+    last_30d: Decimal
+
+class CouncilRevenue(BaseModel):
+    council_id: int
+    council: str
+    completed_orders: int
+    revenue: Decimal
+
+class AdminStats(BaseModel):
+    generated_at: datetime
+    orders_by_status: List[OrderStatusCount]
+    daily_orders: List[DailyOrderCount]
+    plots_by_region: List[RegionPlotCount]
+    revenue: Revenue
+    top_councils: List[CouncilRevenue]
+
+
+class JobStats(BaseModel):
+    queue: Dict[str, int]
+    counters: Dict[str, int]
+    by_kind: Dict[str, Dict[str, int]]
+    total_runtime_seconds: float
+
+
+class AdmissionClassStats(BaseModel):
+    name: str
+    priority: int
+    limit: int
+    max_queue: int
+    max_wait_seconds: float
+    in_flight: int
+    queued: int
+    admitted: int
+    shed: int
+    timed_out: int
+
+class AdmissionStats(BaseModel):
+    capacity: int
+    in_flight: int
+    queued: int
+    classes: List[AdmissionClassStats]
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+from decimal import Decimal
+
+class PriceStats(BaseModel):
+    level: str
+    area_id: int
+    area_name: Optional[str] = None
+    usage_type: str
+    plot_count: int
+    p25: Decimal
+    median: Decimal
+    p75: Decimal
+    mean: Decimal
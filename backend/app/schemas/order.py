@@ -1,6 +1,7 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
+from uuid import UUID
 
 class OrderBase(BaseModel):
     plot_id: str
@@ -12,8 +13,9 @@ class OrderUpdate(BaseModel):
     order_status: Optional[str] = None
 
 class OrderInDB(OrderBase):
-    id: str
-    user_id: str
+    id: UUID
+    user_id: UUID
+    plot_id: UUID
     order_status: str
     created_at: datetime
     
@@ -23,6 +25,10 @@ class OrderInDB(OrderBase):
 class Order(OrderInDB):
     pass
 
+class OrderBatch(BaseModel):
+    items: List[Order]
+    missing: List[str]
+
 class OrderWithDetails(Order):
     user: Optional[dict] = None
     plot: Optional[dict] = None
\ No newline at end of file
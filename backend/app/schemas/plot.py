@@ -1,7 +1,8 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, model_validator
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 from decimal import Decimal
+from uuid import UUID
 from app.db.models import PlotStatus
 
 class PlotBase(BaseModel):
@@ -15,7 +16,15 @@ class PlotBase(BaseModel):
     image_urls: Optional[List[str]] = []
 
 class PlotCreate(PlotBase):
-    pass
+    # GeoJSON polygon in EPSG:4326. When given, area_sqm defaults to its geodesic area.
+    area_sqm: Optional[Decimal] = None
+    geometry: Optional[Dict[str, Any]] = None
+    
+    @model_validator(mode="after")
+    def check_area_or_geometry(self):
+        if self.area_sqm is None and self.geometry is None:
+            raise ValueError("Either area_sqm or geometry is required")
+        return self
 
 class PlotUpdate(BaseModel):
     title: Optional[str] = None
@@ -27,12 +36,16 @@ class PlotUpdate(BaseModel):
     council_id: Optional[int] = None
     image_urls: Optional[List[str]] = None
     status: Optional[PlotStatus] = None
+    geometry: Optional[Dict[str, Any]] = None
 
 class PlotInDB(PlotBase):
-    id: str
+    id: UUID
     status: PlotStatus
-    uploaded_by_id: Optional[str] = None
+    uploaded_by_id: Optional[UUID] = None
     created_at: datetime
+    price_per_sqm: Optional[Decimal] = None
+    centroid_lon: Optional[float] = None
+    centroid_lat: Optional[float] = None
     
     class Config:
         from_attributes = True
@@ -43,6 +56,26 @@ class Plot(PlotInDB):
 class PlotWithLocation(Plot):
     council: Optional[dict] = None
 
+class SimilarPlot(Plot):
+    distance_m: Optional[float] = None
+
+class PlotBatch(BaseModel):
+    items: List[Plot]
+    missing: List[str]
+
+class PlotCluster(BaseModel):
+    lon: float
+    lat: float
+    count: int
+    min_price: Decimal
+    max_price: Decimal
+    plot_id: Optional[UUID] = None
+    statuses: Dict[str, int]
+
+class PlotClusters(BaseModel):
+    zoom: int
+    clusters: List[PlotCluster]
+
 class PlotSearch(BaseModel):
     search: Optional[str] = None
     min_price: Optional[Decimal] = None
@@ -53,4 +86,5 @@ class PlotSearch(BaseModel):
     district_id: Optional[int] = None
     council_id: Optional[int] = None
     usage_type: Optional[str] = None
-    status: Optional[PlotStatus] = PlotStatus.AVAILABLE
\ No newline at end of file
+    status: Optional[PlotStatus] = PlotStatus.AVAILABLE
+    sort: Optional[str] = "newest"
\ No newline at end of file
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from uuid import UUID
+from app.schemas.plot import PlotSearch
+
+class SavedSearchBase(BaseModel):
+    name: str
+    criteria: PlotSearch
+    notify: bool = True
+
+class SavedSearchCreate(SavedSearchBase):
+    pass
+
+class SavedSearch(SavedSearchBase):
+    id: UUID
+    user_id: UUID
+    created_at: datetime
+    last_notified_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class Suggestion(BaseModel):
+    kind: str
+    id: str
+    label: str
+    detail: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
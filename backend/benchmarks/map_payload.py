@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Compare response size and encode time of the plot list formats on
+synthetic plots: full Plot JSON (as GET /api/plots/ serializes it) against
+the columns and packed map payloads.
+
+    python benchmarks/map_payload.py --plots 1000 5000 20000
+"""
+
+import sys
+import os
+import argparse
+import gzip
+import json
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from app.core.map_payload import encode_columns, encode_packed
+from app.db.models import PlotStatus
+from app.schemas.plot import Plot
+
+USAGE_TYPES = ["Residential", "Commercial", "Agricultural", "Industrial"]
+STATUS_WEIGHTS = [0.7, 0.05, 0.05, 0.2]
+
+def make_rows(count: int, seed: int) -> list:
+    """Synthetic plot rows with the attributes the Plot schema reads."""
+    rng = random.Random(seed)
+    created = datetime(2024, 1, 1)
+    rows = []
+    for number in range(count):
+        area = Decimal(rng.randint(300, 5000))
+        price = Decimal(rng.randint(5, 500) * 1_000_000)
+        rows.append({
+            "id": uuid.UUID(int=rng.getrandbits(128)),
+            "title": f"Plot {number} in block {rng.randint(1, 400)}",
+            "description": "Surveyed plot with title deed, close to the main road.",
+            "area_sqm": area,
+            "price": price,
+            "usage_type": rng.choice(USAGE_TYPES),
+            "plot_number": f"PLT-{number:06d}",
+            "council_id": rng.randint(1, 180),
+            "image_urls": [f"https://example.com/plots/{number}.jpg"],
+            "status": rng.choices(list(PlotStatus), STATUS_WEIGHTS)[0],
+            "uploaded_by_id": uuid.UUID(int=rng.getrandbits(128)),
+            "created_at": created + timedelta(minutes=number),
+            "price_per_sqm": (price / area).quantize(Decimal("0.01")),
+            "centroid_lon": rng.uniform(29.3, 40.4),
+            "centroid_lat": rng.uniform(-11.7, -1.0),
+        })
+    return rows
+
+def encode_full(rows: list) -> bytes:
+    # Same steps FastAPI takes for a List[Plot] response_model.
+    plots = [Plot.model_validate(row) for row in rows]
+    return json.dumps(jsonable_encoder(plots)).encode("utf-8")
+
+def to_points(rows: list) -> list:
+    return [
+        (row["id"], row["centroid_lon"], row["centroid_lat"], row["price"], row["status"])
+        for row in rows
+    ]
+
+def time_encoder(encode, data, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = encode(data)
+        timings.append(time.perf_counter() - started)
+    return body, statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark plot list payload formats")
+    parser.add_argument("--plots", type=int, nargs="+", default=[1000, 5000, 20000], help="Plot counts to test")
+    parser.add_argument("--repeat", type=int, default=5, help="Encode runs per format; the median is reported")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'plots':>7} {'format':<8} {'bytes':>11} {'gzip bytes':>11} {'encode ms':>10} {'vs json':>8}")
+    for count in args.plots:
+        rows = make_rows(count, args.seed)
+        points = to_points(rows)
+        results = [
+            ("json",) + time_encoder(encode_full, rows, args.repeat),
+            ("columns",) + time_encoder(encode_columns, points, args.repeat),
+            ("packed",) + time_encoder(encode_packed, points, args.repeat),
+        ]
+        baseline = len(results[0][1])
+        for name, body, seconds in results:
+            print(
+                f"{count:>7} {name:<8} {len(body):>11,} {len(gzip.compress(body)):>11,} "
+                f"{seconds * 1000:>10.1f} {len(body) / baseline:>7.0%}"
+            )
+
+if __name__ == "__main__":
+    main()
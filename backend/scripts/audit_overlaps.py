@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Script to find every pair of plots whose polygons overlap by more than a
+share of the smaller polygon. The spatial self-join is split by region
+(plots without a council form one more partition) and the partitions are
+audited in parallel. Each pair is reported once, from the region of the
+plot with the lower id, as CSV.
+"""
+
+import sys
+import os
+import argparse
+import csv
+from concurrent.futures import ThreadPoolExecutor, as_completed
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.orm import Session, aliased
+from geoalchemy2 import Geography
+from app.core.config import settings
+from app.crud.crud_plot import overlap_ratio
+from app.db.session import SessionLocal
+from app.db.models import Council, District, Plot, Region
+
+COLUMNS = ["region_id", "plot_id", "plot_number", "other_plot_id", "other_plot_number", "overlap_ratio", "overlap_sqm"]
+
+def audit_partition(region_id, min_ratio: float):
+    """Find overlapping pairs whose lower-id plot lies in the region (None for plots without a council)."""
+    plot = aliased(Plot, name="plot")
+    other = aliased(Plot, name="other")
+    ratio = overlap_ratio(plot.geom, other.geom, plot.geom_area_sqm, other.geom_area_sqm)
+    
+    query = select(
+        plot.id, plot.plot_number, other.id, other.plot_number,
+        cast(ratio, Float).label("ratio"),
+        func.ST_Area(cast(func.ST_Intersection(plot.geom, other.geom), Geography(srid=4326)), False).label("overlap_sqm")
+    ).join(
+        other, (plot.id < other.id) & func.ST_Intersects(plot.geom, other.geom)
+    ).where(ratio > min_ratio)
+    
+    if region_id is None:
+        query = query.where(plot.council_id.is_(None))
+    else:
+        query = query.where(plot.council_id.in_(
+            select(Council.id).join(District).where(District.region_id == region_id)
+        ))
+    
+    db: Session = SessionLocal()
+    try:
+        return [(region_id, *row) for row in db.execute(query)]
+    finally:
+        db.close()
+
+def audit_overlaps(output, workers: int, min_ratio: float) -> list:
+    """Audit every region in parallel and write overlapping pairs as CSV.
+
+    Returns the partitions that could not be audited.
+    """
+    db: Session = SessionLocal()
+    try:
+        partitions = [region_id for (region_id,) in db.query(Region.id).order_by(Region.id)] + [None]
+    finally:
+        db.close()
+    
+    writer = csv.writer(output)
+    writer.writerow(COLUMNS)
+    pairs = 0
+    failed = []
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(audit_partition, region_id, min_ratio): region_id for region_id in partitions}
+        for future in as_completed(futures):
+            region_id = futures[future]
+            try:
+                rows = future.result()
+            except Exception as e:
+                print(f"Error auditing region {region_id}: {e}", file=sys.stderr)
+                failed.append(region_id)
+                continue
+            writer.writerows(rows)
+            pairs += len(rows)
+            print(f"Region {region_id if region_id is not None else '(none)'}: {len(rows)} overlapping pairs", file=sys.stderr)
+    
+    if failed:
+        print(f"Audit incomplete: {pairs} overlapping pairs, {len(failed)} regions failed", file=sys.stderr)
+    else:
+        print(f"Audit complete: {pairs} overlapping pairs", file=sys.stderr)
+    return failed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", help="CSV file to write; defaults to stdout")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--min-ratio", type=float, default=settings.PLOT_OVERLAP_MAX_RATIO,
+                        help="Report pairs overlapping by more than this share of the smaller plot")
+    args = parser.parse_args()
+    
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as output:
+            failed = audit_overlaps(output, args.workers, args.min_ratio)
+    else:
+        failed = audit_overlaps(sys.stdout, args.workers, args.min_ratio)
+    # Missed partitions may hide overlaps, so the audit must not pass silently
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Script to assign each plot's council from its centroid and the council
+boundaries. Council boundaries are held in a shapely STRtree and plot
+centroids are matched a batch at a time with vectorized queries, then
+written back with one UPDATE per batch. Run backfill_geometry.py first so
+centroids are populated.
+"""
+
+import sys
+import os
+import argparse
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import shapely
+from geoalchemy2.shape import to_shape
+from sqlalchemy import Integer, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PGUUID
+from sqlalchemy.orm import Session
+from app.db.session import SessionLocal
+from app.db.models import Council, Plot
+
+UPDATE_COUNCILS_SQL = text("""
+    UPDATE plots SET council_id = assigned.council_id
+    FROM unnest(:plot_ids, :council_ids) AS assigned(plot_id, council_id)
+    WHERE plots.id = assigned.plot_id
+""").bindparams(
+    bindparam("plot_ids", type_=ARRAY(PGUUID(as_uuid=True))),
+    bindparam("council_ids", type_=ARRAY(Integer)),
+)
+
+def load_council_tree(db: Session):
+    """Build an STRtree over council boundaries, returning it with the matching council ids."""
+    rows = db.query(Council.id, Council.geom).filter(Council.geom.isnot(None)).order_by(Council.id).all()
+    council_ids = np.array([row.id for row in rows], dtype=np.int64)
+    tree = shapely.STRtree([to_shape(row.geom) for row in rows])
+    return tree, council_ids
+
+def backfill_councils(batch_size: int, reassign: bool):
+    """Assign councils batch by batch, keyed on plot id."""
+    db: Session = SessionLocal()
+    last_id = None
+    scanned = 0
+    assigned = 0
+    started = time.monotonic()
+    
+    try:
+        tree, council_ids = load_council_tree(db)
+        if not len(council_ids):
+            print("No council boundaries loaded; run load_boundaries.py first")
+            return
+        print(f"Loaded {len(council_ids)} council boundaries")
+        
+        while True:
+            query = db.query(Plot.id, Plot.centroid_lon, Plot.centroid_lat).filter(Plot.centroid_lon.isnot(None))
+            if not reassign:
+                query = query.filter(Plot.council_id.is_(None))
+            if last_id is not None:
+                query = query.filter(Plot.id > last_id)
+            rows = query.order_by(Plot.id).limit(batch_size).all()
+            if not rows:
+                break
+            
+            points = shapely.points(
+                np.fromiter((row.centroid_lon for row in rows), dtype=float, count=len(rows)),
+                np.fromiter((row.centroid_lat for row in rows), dtype=float, count=len(rows)),
+            )
+            point_index, council_index = tree.query(points, predicate="covered_by")
+            # A centroid on a shared border matches both councils; keep the lowest id, as the API does
+            order = np.lexsort((council_ids[council_index], point_index))
+            point_index, council_index = point_index[order], council_index[order]
+            point_index, first = np.unique(point_index, return_index=True)
+            council_index = council_index[first]
+            
+            if len(point_index):
+                db.execute(UPDATE_COUNCILS_SQL, {
+                    "plot_ids": [rows[i].id for i in point_index],
+                    "council_ids": council_ids[council_index].tolist(),
+                })
+                db.commit()
+            
+            scanned += len(rows)
+            assigned += len(point_index)
+            last_id = rows[-1].id
+            print(f"Scanned {scanned} plots, assigned {assigned} ({scanned / (time.monotonic() - started):.0f} plots/s)")
+        
+        print(f"Backfill complete: {assigned} of {scanned} plots assigned a council")
+        
+    except Exception as e:
+        print(f"Error backfilling councils: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=50000)
+    parser.add_argument("--all", dest="reassign", action="store_true",
+                        help="Reassign every plot, not just those without a council")
+    args = parser.parse_args()
+    backfill_councils(args.batch_size, args.reassign)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Script to backfill derived geometry columns (area, centroid, bbox,
+simplified shapes) and price per sqm for existing plots.
+Safe to re-run; only plots missing derived values are processed.
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geoalchemy2.shape import to_shape
+from shapely.geometry import mapping
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+from app.core.geometry import GeometryError, prepare_polygon, derive_geometry_fields, price_per_sqm
+from app.db.session import SessionLocal
+from app.db.models import Plot
+
+def backfill_geometry(batch_size: int):
+    """Compute derived columns batch by batch, keyed on plot id."""
+    db: Session = SessionLocal()
+    last_id = None
+    updated = 0
+    skipped = 0
+    
+    try:
+        while True:
+            query = db.query(Plot.id, Plot.geom, Plot.price, Plot.area_sqm).filter(
+                or_(
+                    Plot.price_per_sqm.is_(None),
+                    Plot.geom.isnot(None) & Plot.centroid.is_(None)
+                )
+            )
+            if last_id is not None:
+                query = query.filter(Plot.id > last_id)
+            rows = query.order_by(Plot.id).limit(batch_size).all()
+            if not rows:
+                break
+            
+            values = []
+            for row in rows:
+                fields = {"id": row.id, "price_per_sqm": price_per_sqm(row.price, row.area_sqm)}
+                if row.geom is not None:
+                    try:
+                        fields.update(derive_geometry_fields(prepare_polygon(mapping(to_shape(row.geom)))))
+                    except GeometryError as e:
+                        print(f"Skipping geometry of plot {row.id}: {e}")
+                        skipped += 1
+                values.append(fields)
+            
+            # Rows have different keys when geometry was skipped, so group them
+            for keys in {tuple(sorted(v)) for v in values}:
+                db.execute(update(Plot), [v for v in values if tuple(sorted(v)) == keys])
+            db.commit()
+            
+            updated += len(rows)
+            last_id = rows[-1].id
+            print(f"Updated {updated} plots")
+        
+        print(f"Backfill complete: {updated} plots updated, {skipped} geometries skipped")
+        
+    except Exception as e:
+        print(f"Error backfilling geometry: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    backfill_geometry(args.batch_size)
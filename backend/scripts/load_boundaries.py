@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Script to load region, district or council boundaries from a GeoJSON
+FeatureCollection. Features are matched to existing locations by name
+(case-insensitive), optionally within a parent named by another property.
+Safe to re-run; boundaries are replaced.
+"""
+
+import sys
+import os
+import json
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geoalchemy2.shape import from_shape
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.core.geometry import GeometryError, SRID, prepare_boundary
+from app.db.session import SessionLocal
+from app.db.models import Region, District, Council
+
+LEVELS = {
+    "region": (Region, None, None),
+    "district": (District, Region, "region_id"),
+    "council": (Council, District, "district_id"),
+}
+
+def find_location(db: Session, level: str, name: str, parent_name: str = None):
+    """Find a location by name, within the named parent if given."""
+    model, parent_model, parent_key = LEVELS[level]
+    query = db.query(model).filter(func.lower(model.name) == name.lower())
+    if parent_name and parent_model is not None:
+        query = query.join(parent_model, getattr(model, parent_key) == parent_model.id).filter(
+            func.lower(parent_model.name) == parent_name.lower()
+        )
+    return query.all()
+
+def load_boundaries(level: str, path: str, name_property: str, parent_property: str = None, create: bool = False):
+    """Set the boundary of every location that has a matching feature."""
+    with open(path, encoding="utf-8") as geojson_file:
+        features = json.load(geojson_file)["features"]
+    
+    model, parent_model, parent_key = LEVELS[level]
+    db: Session = SessionLocal()
+    loaded = 0
+    skipped = 0
+    
+    try:
+        for feature in features:
+            properties = feature.get("properties") or {}
+            name = properties.get(name_property)
+            parent_name = properties.get(parent_property) if parent_property else None
+            if not name:
+                print(f"Skipping feature without a {name_property!r} property")
+                skipped += 1
+                continue
+            
+            try:
+                boundary = from_shape(prepare_boundary(feature["geometry"]), srid=SRID)
+            except GeometryError as e:
+                print(f"Skipping {level} {name}: {e}")
+                skipped += 1
+                continue
+            
+            matches = find_location(db, level, name, parent_name)
+            if len(matches) > 1:
+                print(f"Skipping {level} {name}: {len(matches)} locations share this name, pass --parent-property")
+                skipped += 1
+                continue
+            
+            if matches:
+                matches[0].geom = boundary
+            elif create:
+                location = model(name=name, geom=boundary)
+                if parent_model is not None:
+                    parents = db.query(parent_model).filter(
+                        func.lower(parent_model.name) == (parent_name or "").lower()
+                    ).all()
+                    if len(parents) != 1:
+                        print(f"Skipping {level} {name}: parent {parent_name!r} not found")
+                        skipped += 1
+                        continue
+                    setattr(location, parent_key, parents[0].id)
+                db.add(location)
+            else:
+                print(f"Skipping {level} {name}: no such location, pass --create to add it")
+                skipped += 1
+                continue
+            loaded += 1
+        
+        db.commit()
+        print(f"Loaded {loaded} {level} boundaries, {skipped} features skipped")
+        
+    except Exception as e:
+        print(f"Error loading boundaries: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("level", choices=sorted(LEVELS))
+    parser.add_argument("path", help="GeoJSON FeatureCollection in EPSG:4326")
+    parser.add_argument("--name-property", default="name")
+    parser.add_argument("--parent-property", help="Feature property holding the parent region or district name")
+    parser.add_argument("--create", action="store_true", help="Create locations that do not exist yet")
+    args = parser.parse_args()
+    load_boundaries(args.level, args.path, args.name_property, args.parent_property, args.create)
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Run background job workers outside the API process.
+Set JOB_WORKERS_IN_APP=0 on the API when running dedicated workers.
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import logging
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.jobs import start_job_workers, stop_job_workers
+from app.core.scheduler import start_scheduler, stop_scheduler
+
+async def run(concurrency: int):
+    """Run workers and queue maintenance until interrupted."""
+    await start_scheduler()
+    await start_job_workers(concurrency)
+    print(f"Job workers started with concurrency {concurrency}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stop_job_workers()
+        await stop_scheduler()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=4, help="number of concurrent workers")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(run(args.concurrency))
+    except KeyboardInterrupt:
+        print("Job workers stopped")
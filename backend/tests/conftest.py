@@ -0,0 +1,116 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.db.init_db import init_db
+
+PLAN_TEST_DATABASE_URL = os.getenv("PLAN_TEST_DATABASE_URL")
+PLAN_TEST_PLOTS = int(os.getenv("PLAN_TEST_PLOTS", "200000"))
+UPDATE_PLAN_BASELINES = os.getenv("UPDATE_PLAN_BASELINES") == "1"
+
+BASELINES_PATH = Path(__file__).parent / "plan_baselines.json"
+
+# Location hierarchy of the seeded database
+SEED_REGIONS = 30
+SEED_DISTRICTS_PER_REGION = 6
+SEED_COUNCILS_PER_DISTRICT = 4
+
+SEED_LOCATIONS_SQL = """
+INSERT INTO regions (id, name)
+SELECT r, 'Region ' || r FROM generate_series(1, :regions) AS r;
+
+INSERT INTO districts (id, name, region_id)
+SELECT d, 'District ' || d, 1 + (d - 1) / :districts_per_region
+FROM generate_series(1, :regions * :districts_per_region) AS d;
+
+INSERT INTO councils (id, name, district_id)
+SELECT c, 'Council ' || c, 1 + (c - 1) / :councils_per_district
+FROM generate_series(1, :regions * :districts_per_region * :councils_per_district) AS c;
+"""
+
+# Skewed like production: most plots are available and residential, a few
+# councils hold most listings, and prices scale with area.
+SEED_PLOTS_SQL = """
+INSERT INTO plots (
+    id, plot_number, title, description, area_sqm, price, price_per_sqm,
+    usage_type, status, council_id, image_urls, created_at
+)
+SELECT
+    gen_random_uuid(),
+    'PLT-' || g,
+    (ARRAY['Beach plot', 'Hillside plot', 'Corner plot', 'Farm land', 'Town centre plot', 'Estate plot'])[1 + g % 6]
+        || ' ' || g,
+    'Surveyed plot with title deed, ' || md5(g::text),
+    area,
+    price,
+    round(price / area, 2),
+    (ARRAY['Residential', 'Residential', 'Residential', 'Commercial', 'Agricultural', 'Industrial'])[1 + g % 6],
+    (ARRAY['AVAILABLE', 'AVAILABLE', 'AVAILABLE', 'AVAILABLE', 'AVAILABLE', 'AVAILABLE', 'AVAILABLE',
+           'LOCKED', 'PENDING_PAYMENT', 'SOLD'])[1 + g % 10]::plotstatus,
+    1 + floor(power(random(), 3) * :councils)::int,
+    CASE WHEN g % 3 = 0 THEN ARRAY[]::text[] ELSE ARRAY['https://example.com/plots/' || g || '.jpg'] END,
+    now() - (g || ' minutes')::interval
+FROM (
+    SELECT g, round((200 + random() * 19800)::numeric, 2) AS area
+    FROM generate_series(1, :plots) AS g
+) AS seed,
+LATERAL (SELECT round(area * (5000 + random() * 95000)::numeric, 2) AS price) AS priced
+"""
+
+def seed_plan_database(engine, plots: int) -> None:
+    """Seed locations and plots unless the database already holds enough plots."""
+    with engine.begin() as connection:
+        existing = connection.execute(text("SELECT count(*) FROM plots")).scalar()
+        if existing >= plots:
+            return
+
+        connection.execute(text("TRUNCATE plots, councils, districts, regions RESTART IDENTITY CASCADE"))
+        params = {
+            "regions": SEED_REGIONS,
+            "districts_per_region": SEED_DISTRICTS_PER_REGION,
+            "councils_per_district": SEED_COUNCILS_PER_DISTRICT,
+        }
+        for statement in SEED_LOCATIONS_SQL.split(";"):
+            if statement.strip():
+                connection.execute(text(statement), params)
+        connection.execute(text(SEED_PLOTS_SQL), {
+            "plots": plots,
+            "councils": SEED_REGIONS * SEED_DISTRICTS_PER_REGION * SEED_COUNCILS_PER_DISTRICT,
+        })
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("ANALYZE regions, districts, councils, plots"))
+
+@pytest.fixture(scope="session")
+def plan_engine():
+    if not PLAN_TEST_DATABASE_URL:
+        pytest.skip("Set PLAN_TEST_DATABASE_URL to a scratch PostGIS database to run query-plan tests")
+
+    engine = create_engine(PLAN_TEST_DATABASE_URL)
+    init_db(engine)
+    seed_plan_database(engine, PLAN_TEST_PLOTS)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def plan_session(plan_engine):
+    session = Session(bind=plan_engine)
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture(scope="session")
+def plan_baselines():
+    """Indexes used on plots by case id; rewritten at the end of the run with UPDATE_PLAN_BASELINES=1."""
+    baselines = json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+    current = {}
+    yield baselines, current
+    if UPDATE_PLAN_BASELINES and current:
+        # One case per line keeps the file short and its diffs readable
+        lines = [f"{json.dumps(case_id)}: {json.dumps(indexes)}" for case_id, indexes in sorted({**baselines, **current}.items())]
+        BASELINES_PATH.write_text("{\n" + ",\n".join(lines) + "\n}\n")
@@ -0,0 +1,81 @@
+"""Unit tests for admission control classification and priority dispatch."""
+import asyncio
+
+from app.core.admission import (
+    AUTH, BROWSE, ORDER_CREATE, READ, WRITE, AdmissionController, RouteClass, classify
+)
+
+HIGH = RouteClass("high", priority=0, share=1.0, max_queue=10, max_wait_seconds=1.0)
+LOW = RouteClass("low", priority=1, share=1.0, max_queue=10, max_wait_seconds=1.0)
+CAPPED = RouteClass("capped", priority=0, share=0.5, max_queue=10, max_wait_seconds=1.0)
+
+def test_classify():
+    assert classify("POST", "/api/auth/login", False) is AUTH
+    assert classify("POST", "/api/orders/", True) is ORDER_CREATE
+    assert classify("PUT", "/api/orders/1", True) is WRITE
+    assert classify("GET", "/api/plots/", False) is BROWSE
+    assert classify("GET", "/api/plots/", True) is READ
+    assert classify("GET", "/api/regions", False) is READ
+
+def test_waiters_are_admitted_by_priority_then_arrival():
+    async def scenario():
+        controller = AdmissionController(1, route_classes=(HIGH, LOW))
+        assert await controller.acquire(LOW)
+        admitted = []
+
+        async def wait(route_class, name):
+            if await controller.acquire(route_class):
+                admitted.append((name, route_class))
+
+        waiting = [
+            asyncio.create_task(wait(LOW, "low-1")),
+            asyncio.create_task(wait(HIGH, "high-1")),
+            asyncio.create_task(wait(HIGH, "high-2")),
+        ]
+        await asyncio.sleep(0)
+        assert controller.snapshot()["queued"] == 3
+        holder = LOW
+        for expected in range(1, len(waiting) + 1):
+            # Free the single slot and let exactly one waiter take it
+            controller.release(holder)
+            while len(admitted) < expected:
+                await asyncio.sleep(0)
+            holder = admitted[-1][1]
+        await asyncio.gather(*waiting)
+        return [name for name, _ in admitted]
+
+    assert asyncio.run(scenario()) == ["high-1", "high-2", "low-1"]
+
+def test_class_at_its_share_lets_others_through():
+    async def scenario():
+        controller = AdmissionController(2, route_classes=(CAPPED, LOW))
+        assert controller.limits["capped"] == 1
+        assert await controller.acquire(CAPPED)
+        waiter = asyncio.create_task(controller.acquire(CAPPED))
+        await asyncio.sleep(0)
+        # The queued capped request cannot use the free slot, a low one can
+        assert await controller.acquire(LOW)
+        controller.release(CAPPED)
+        assert await waiter
+        return controller.snapshot()
+
+    snapshot = asyncio.run(scenario())
+    assert snapshot["in_flight"] == 2
+    assert snapshot["queued"] == 0
+
+def test_full_queue_sheds_and_waiters_time_out():
+    impatient = RouteClass("impatient", priority=0, share=1.0, max_queue=1, max_wait_seconds=0.01)
+
+    async def scenario():
+        controller = AdmissionController(1, route_classes=(impatient,))
+        assert await controller.acquire(impatient)
+        waiter = asyncio.create_task(controller.acquire(impatient))
+        await asyncio.sleep(0)
+        assert not await controller.acquire(impatient)
+        assert not await waiter
+        return controller.snapshot()["classes"][0]
+
+    counters = asyncio.run(scenario())
+    assert counters["shed"] == 1
+    assert counters["timed_out"] == 1
+    assert counters["queued"] == 0
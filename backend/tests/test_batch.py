@@ -0,0 +1,31 @@
+"""Unit tests for batch id parsing and ordering."""
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.batch import order_batch, parse_batch_ids
+from app.core.config import settings
+
+def test_parse_batch_ids_dedupes_in_request_order():
+    first, second = uuid4(), uuid4()
+    requested, valid = parse_batch_ids(f" {first}, not-a-uuid,{second},,{first} ")
+    assert requested == [str(first), "not-a-uuid", str(second)]
+    assert valid == [first, second]
+
+def test_parse_batch_ids_rejects_too_many_ids():
+    ids = ",".join(str(uuid4()) for _ in range(settings.BATCH_MAX_IDS + 1))
+    with pytest.raises(HTTPException) as error:
+        parse_batch_ids(ids)
+    assert error.value.status_code == 400
+
+def test_order_batch_follows_request_and_lists_missing():
+    found, absent = uuid4(), uuid4()
+    other = uuid4()
+    rows = [SimpleNamespace(id=other), SimpleNamespace(id=found)]
+    # Ids are matched in canonical form, whatever case they were requested in
+    requested = [str(absent), "bad", str(found).upper(), str(other)]
+    items, missing = order_batch(requested, rows)
+    assert [row.id for row in items] == [found, other]
+    assert missing == [str(absent), "bad"]
@@ -0,0 +1,42 @@
+"""Unit tests for the in-process TTL cache."""
+from app.core.cache import TTLCache
+
+def test_get_returns_stored_value():
+    cache = TTLCache(ttl_seconds=60)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+
+def test_expired_entries_are_dropped():
+    cache = TTLCache(ttl_seconds=60)
+    cache.set("stale", 1, ttl_seconds=-1)
+    assert cache.get("stale") is None
+    assert len(cache) == 0
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+def test_invalidate_removes_matching_entries():
+    cache = TTLCache(ttl_seconds=60)
+    for zoom in (1, 2, 3):
+        cache.set(("clusters", zoom), zoom)
+    assert cache.invalidate(lambda key, value: value >= 2) == 2
+    assert cache.get(("clusters", 1)) == 1
+    assert len(cache) == 1
+
+def test_delete_and_clear():
+    cache = TTLCache(ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.delete("a")
+    cache.delete("a")
+    assert cache.get("a") is None
+    cache.clear()
+    assert len(cache) == 0
@@ -0,0 +1,71 @@
+"""Unit tests for the streaming export encoders."""
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from app.core.export import buffered, encode_csv, encode_geojson, encode_ndjson, gzipped, json_default
+from app.db.models import PlotStatus
+
+PLOT_ID = UUID("8a6e0804-2bd0-4672-b79d-d97027f9071a")
+ROWS = [
+    {
+        "id": PLOT_ID,
+        "price": Decimal("1500000.50"),
+        "status": PlotStatus.AVAILABLE,
+        "created_at": datetime(2024, 3, 1, 12, 30),
+        "title": "Beach plot, \"north\"",
+    },
+    {"id": None, "price": None, "status": PlotStatus.SOLD, "created_at": None, "title": "Farm"},
+]
+
+def test_json_default_converts_database_values():
+    assert json_default(Decimal("1500000.50")) == "1500000.50"
+    assert json_default(PLOT_ID) == str(PLOT_ID)
+    assert json_default(PlotStatus.SOLD) == PlotStatus.SOLD.value
+    assert json_default(datetime(2024, 3, 1)) == "2024-03-01T00:00:00"
+    with pytest.raises(TypeError):
+        json_default(object())
+
+def test_ndjson_writes_one_object_per_line():
+    lines = "".join(encode_ndjson(ROWS)).splitlines()
+    assert len(lines) == 2
+    first = json.loads(lines[0])
+    assert first["id"] == str(PLOT_ID)
+    assert first["price"] == "1500000.50"
+    assert first["status"] == PlotStatus.AVAILABLE.value
+
+def test_csv_writes_header_and_quoted_values():
+    columns = ["id", "price", "status", "created_at", "title"]
+    body = "".join(encode_csv(ROWS, columns))
+    rows = list(csv.reader(io.StringIO(body)))
+    assert rows[0] == columns
+    assert rows[1] == [str(PLOT_ID), "1500000.50", PlotStatus.AVAILABLE.value, "2024-03-01T12:30:00", 'Beach plot, "north"']
+    assert rows[2] == ["", "", PlotStatus.SOLD.value, "", "Farm"]
+
+def test_geojson_splices_serialized_geometry():
+    geometry = '{"type":"Point","coordinates":[39.2,-6.8]}'
+    rows = [{"id": "a", "geometry": geometry}, {"id": "b", "geometry": None}]
+    collection = json.loads("".join(encode_geojson(rows)))
+    assert collection["type"] == "FeatureCollection"
+    assert collection["features"][0]["geometry"] == json.loads(geometry)
+    assert collection["features"][0]["properties"] == {"id": "a"}
+    assert collection["features"][1]["geometry"] is None
+
+def test_geojson_without_rows_is_empty_collection():
+    assert json.loads("".join(encode_geojson([]))) == {"type": "FeatureCollection", "features": []}
+
+def test_buffered_flushes_first_chunk_then_coalesces():
+    chunks = list(buffered(["head", "aa", "bb", "cc", "d"], chunk_bytes=4))
+    assert chunks == [b"head", b"aabb", b"ccd"]
+
+def test_gzipped_stream_round_trips():
+    text = "".join(encode_ndjson(ROWS * 500))
+    chunks = list(gzipped(buffered([text[i:i + 1000] for i in range(0, len(text), 1000)], chunk_bytes=4096)))
+    assert len(chunks) > 1
+    assert gzip.decompress(b"".join(chunks)).decode("utf-8") == text
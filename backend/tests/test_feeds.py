@@ -0,0 +1,104 @@
+"""Unit tests for the in-memory homepage feeds."""
+import json
+from datetime import datetime, timedelta
+
+from app.core.feeds import LATEST, FeedStore, featured_feed, feeds_for
+from app.db.models import PlotStatus
+
+START = datetime(2024, 1, 1)
+
+def _snapshot(number, region_id=1, image=True, status=PlotStatus.AVAILABLE):
+    return {
+        "id": f"plot-{number}",
+        "created_at": START + timedelta(minutes=number),
+        "status": status,
+        "region_id": region_id,
+        "image_urls": ["https://example.com/plot.jpg"] if image else [],
+    }
+
+def _body(number) -> bytes:
+    return json.dumps({"id": f"plot-{number}"}).encode("utf-8")
+
+def _rows(numbers):
+    return [(START + timedelta(minutes=number), f"plot-{number}", _body(number)) for number in numbers]
+
+def _ids(payload: bytes):
+    return [plot["id"] for plot in json.loads(payload)]
+
+def test_feeds_for_needs_available_plot_with_images_for_featured():
+    assert feeds_for(_snapshot(1)) == [LATEST, featured_feed(1)]
+    assert feeds_for(_snapshot(1, image=False)) == [LATEST]
+    assert feeds_for(_snapshot(1, status=PlotStatus.SOLD)) == []
+
+def test_load_serves_newest_first_up_to_size():
+    store = FeedStore(size=2, keep=3)
+    store.load({LATEST: _rows([1, 4, 2, 3])})
+    assert store.ready
+    assert _ids(store.payload(LATEST)) == ["plot-4", "plot-3"]
+    assert store.payload("unknown") == b"[]"
+
+def test_apply_adds_newer_plot_and_removes_withdrawn_one():
+    store = FeedStore(size=2, keep=4)
+    store.load({LATEST: _rows([1, 2])})
+    store.apply("plot-3", _snapshot(3), _body(3))
+    assert _ids(store.payload(LATEST)) == ["plot-3", "plot-2"]
+    store.apply("plot-3", None)
+    assert _ids(store.payload(LATEST)) == ["plot-2", "plot-1"]
+    assert not store.dirty
+
+def test_wants_only_plots_that_would_rank():
+    store = FeedStore(size=1, keep=2)
+    store.load({LATEST: _rows([5, 6])})
+    assert store.wants(_snapshot(7, image=False))
+    assert not store.wants(_snapshot(1, image=False))
+    assert not store.wants(_snapshot(9, status=PlotStatus.SOLD))
+
+def test_truncated_feed_running_short_is_dirty_until_refilled():
+    store = FeedStore(size=2, keep=2)
+    store.load({LATEST: _rows([1, 2, 3]), featured_feed(1): _rows([1])})
+    store.apply("plot-3", None)
+    assert store.dirty_feeds() == {LATEST}
+    store.refill({LATEST: _rows([1, 2])})
+    assert not store.dirty
+    assert _ids(store.payload(LATEST)) == ["plot-2", "plot-1"]
+    assert _ids(store.payload(featured_feed(1))) == ["plot-1"]
+
+def test_feed_that_was_not_truncated_is_never_dirty():
+    store = FeedStore(size=2, keep=3)
+    store.load({LATEST: _rows([1, 2])})
+    store.apply("plot-2", None)
+    assert not store.dirty
+
+def test_featured_payload_keys_non_empty_feeds_by_region():
+    store = FeedStore(size=2)
+    store.load({featured_feed(1): _rows([1]), featured_feed(2): [], LATEST: _rows([1])})
+    assert json.loads(store.featured_payload()) == {"1": [{"id": "plot-1"}]}
+
+def test_change_during_read_is_replayed_onto_loaded_feeds():
+    store = FeedStore(size=2, keep=4)
+    store.load({LATEST: _rows([1, 2])})
+    with store.reading() as since:
+        # The database read sees plot 2 as available, but it is sold meanwhile
+        rows = {LATEST: _rows([1, 2])}
+        store.apply("plot-2", None)
+        store.apply("plot-3", _snapshot(3), _body(3))
+        store.load(rows, since)
+    assert _ids(store.payload(LATEST)) == ["plot-3", "plot-1"]
+
+def test_refill_replays_only_onto_refilled_feeds():
+    store = FeedStore(size=2, keep=4)
+    store.load({LATEST: _rows([1]), featured_feed(1): _rows([1])})
+    with store.reading() as since:
+        rows = {featured_feed(1): _rows([1])}
+        store.apply("plot-5", _snapshot(5), _body(5))
+        store.refill(rows, since)
+    assert _ids(store.payload(featured_feed(1))) == ["plot-5", "plot-1"]
+    assert _ids(store.payload(LATEST)) == ["plot-5", "plot-1"]
+
+def test_changes_before_read_are_not_replayed():
+    store = FeedStore(size=2, keep=4)
+    store.load({LATEST: _rows([1])})
+    store.apply("plot-2", _snapshot(2), _body(2))
+    with store.reading() as since:
+        store.load({LATEST: _rows([1])}, since)
+    assert _ids(store.payload(LATEST)) == ["plot-1"]
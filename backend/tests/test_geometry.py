@@ -0,0 +1,73 @@
+"""Unit tests for plot polygon validation, repair and derived fields."""
+from decimal import Decimal
+
+import pytest
+
+from app.core.geometry import (
+    GeometryError, PlotOverlapError, derive_geometry_fields, geodesic_area, prepare_boundary,
+    prepare_polygon, price_per_sqm
+)
+
+def _polygon(*rings):
+    return {"type": "Polygon", "coordinates": [list(ring) for ring in rings]}
+
+# About 111 m x 111 m at the equator
+SQUARE = [(0, 0), (0.001, 0), (0.001, 0.001), (0, 0.001), (0, 0)]
+
+def test_prepare_polygon_orients_exterior_counter_clockwise():
+    polygon = prepare_polygon(_polygon(reversed(SQUARE)))
+    assert polygon.exterior.is_ccw
+
+def test_prepare_polygon_repairs_invalid_ring():
+    # A spike back along an edge makes the ring self-touching but repairable
+    spiked = [(0, 0), (0.001, 0), (0.002, 0), (0.001, 0), (0.001, 0.001), (0, 0.001), (0, 0)]
+    polygon = prepare_polygon(_polygon(spiked))
+    assert polygon.is_valid
+    assert polygon.area == pytest.approx(1e-6)
+
+def test_prepare_polygon_rejects_bow_tie():
+    bow_tie = [(0, 0), (0.001, 0.001), (0.001, 0), (0, 0.001), (0, 0)]
+    with pytest.raises(GeometryError, match="2 separate polygons"):
+        prepare_polygon(_polygon(bow_tie))
+
+@pytest.mark.parametrize("geojson, message", [
+    ({"type": "Polygon", "coordinates": "nope"}, "Invalid GeoJSON"),
+    ({"type": "Point", "coordinates": [0, 0]}, "must be a polygon"),
+    (_polygon([(0, 0), (200, 0), (200, 1), (0, 0)]), "EPSG:4326"),
+    (_polygon([(0, 0), (1, 1), (2, 2), (0, 0)]), "Geometry"),
+])
+def test_prepare_polygon_rejects_unusable_geometry(geojson, message):
+    with pytest.raises(GeometryError, match=message):
+        prepare_polygon(geojson)
+
+def test_prepare_boundary_keeps_every_part():
+    far = [(lon + 1, lat) for lon, lat in SQUARE]
+    boundary = prepare_boundary({"type": "MultiPolygon", "coordinates": [[SQUARE], [far]]})
+    assert len(boundary.geoms) == 2
+
+def test_geodesic_area_of_square_and_hole():
+    polygon = prepare_polygon(_polygon(SQUARE))
+    assert geodesic_area(polygon) == pytest.approx(111.195 ** 2, rel=1e-3)
+    hole = [(0.0004, 0.0004), (0.0006, 0.0004), (0.0006, 0.0006), (0.0004, 0.0006), (0.0004, 0.0004)]
+    with_hole = prepare_polygon(_polygon(SQUARE, hole))
+    assert geodesic_area(with_hole) == pytest.approx(geodesic_area(polygon) * 0.96, rel=1e-3)
+
+def test_geodesic_area_shrinks_with_latitude():
+    north = prepare_polygon(_polygon([(lon, lat + 60) for lon, lat in SQUARE]))
+    assert geodesic_area(north) == pytest.approx(111.195 ** 2 / 2, rel=1e-2)
+
+def test_derive_geometry_fields():
+    fields = derive_geometry_fields(prepare_polygon(_polygon(SQUARE)))
+    assert fields["geom_area_sqm"] == Decimal(str(round(geodesic_area(prepare_polygon(_polygon(SQUARE))), 2)))
+    assert fields["centroid_lon"] == pytest.approx(0.0005)
+    assert (fields["bbox_min_lon"], fields["bbox_max_lat"]) == (0, 0.001)
+    assert set(fields["geom_simplified"]) == {"6", "10", "14"}
+
+def test_price_per_sqm():
+    assert price_per_sqm(Decimal("1000"), Decimal("3")) == Decimal("333.33")
+    assert price_per_sqm(None, Decimal("3")) is None
+    assert price_per_sqm(Decimal("1000"), Decimal("0")) is None
+
+def test_overlap_error_names_plots():
+    error = PlotOverlapError([("id-1", "PLT-1", 0.25), ("id-2", None, 0.5)])
+    assert str(error) == "Plot overlaps existing plots: PLT-1 (25%), id-2 (50%)"
@@ -0,0 +1,49 @@
+"""Unit tests for the compact map payload encoders."""
+import json
+import math
+import struct
+from decimal import Decimal
+from uuid import uuid4
+
+from app.core.map_payload import PACKED_HEADER, PACKED_MAGIC, STATUS_CODES, encode_columns, encode_packed
+from app.db.models import PlotStatus
+
+POINTS = [
+    (uuid4(), 39.2083, -6.7924, Decimal("150000000.50"), PlotStatus.AVAILABLE),
+    (uuid4(), None, None, Decimal("2000000"), PlotStatus.SOLD),
+]
+
+def test_columns_payload():
+    body = json.loads(encode_columns(POINTS))
+    assert body["count"] == 2
+    assert body["statuses"] == [plot_status.value for plot_status in STATUS_CODES]
+    assert body["id"] == [str(point[0]) for point in POINTS]
+    assert body["lon"] == [39.2083, None]
+    assert body["price"] == [150000000.5, 2000000.0]
+    assert [body["statuses"][code] for code in body["status"]] == ["available", "sold"]
+
+def test_packed_payload_layout():
+    body = encode_packed(POINTS)
+    magic, count = PACKED_HEADER.unpack_from(body)
+    assert (magic, count) == (PACKED_MAGIC, 2)
+
+    offset = PACKED_HEADER.size
+    prices = struct.unpack_from("<2d", body, offset)
+    offset += 2 * 8
+    lons = struct.unpack_from("<2f", body, offset)
+    offset += 2 * 4
+    lats = struct.unpack_from("<2f", body, offset)
+    offset += 2 * 4
+    ids = [body[offset + 16 * i:offset + 16 * (i + 1)] for i in range(2)]
+    offset += 2 * 16
+    statuses = list(body[offset:])
+
+    assert prices == (150000000.5, 2000000.0)
+    assert lons[0] == struct.unpack("<f", struct.pack("<f", 39.2083))[0]
+    assert math.isnan(lons[1]) and math.isnan(lats[1])
+    assert ids == [point[0].bytes for point in POINTS]
+    assert [STATUS_CODES[code] for code in statuses] == [PlotStatus.AVAILABLE, PlotStatus.SOLD]
+
+def test_empty_payloads():
+    assert json.loads(encode_columns([]))["count"] == 0
+    assert encode_packed([]) == PACKED_HEADER.pack(PACKED_MAGIC, 0)
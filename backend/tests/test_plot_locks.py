@@ -0,0 +1,41 @@
+"""Unit tests for the grid-cell advisory lock keys of plot geometry writes."""
+import itertools
+
+from app.crud.crud_plot import PLOT_LOCK_CELL_DEGREES, PLOT_LOCK_MAX_CELLS, plot_lock_cells
+
+INT4_MAX = 2 ** 31 - 1
+STEP = PLOT_LOCK_CELL_DEGREES
+
+def _key(lon: float, lat: float) -> int:
+    # A point inside one cell, away from its edges
+    (key,) = plot_lock_cells((lon, lat, lon, lat))
+    return key
+
+def test_neighbouring_cells_have_distinct_keys():
+    lons = [-180 + STEP / 2, -0.5 * STEP, 0.5 * STEP, 39.2, 180 - STEP / 2]
+    lats = [-90 + STEP / 2, -6.8, 0.5 * STEP, 90 - STEP / 2]
+    points = [
+        (lon + dx * STEP, lat + dy * STEP)
+        for lon, lat in itertools.product(lons, lats)
+        for dx, dy in itertools.product((-1, 0, 1), repeat=2)
+        if -180 < lon + dx * STEP < 180 and -90 < lat + dy * STEP < 90
+    ]
+    keys = {(round(lon / STEP - 0.5), round(lat / STEP - 0.5)): _key(lon, lat) for lon, lat in points}
+    assert len(set(keys.values())) == len(keys)
+
+def test_keys_fit_in_int4_including_edges():
+    corners = [(-180, -90), (-180, 90), (180, -90), (180, 90), (0, 0)]
+    keys = [_key(lon, lat) for lon, lat in corners]
+    assert all(0 <= key <= INT4_MAX for key in keys)
+    assert len(set(keys)) == len(keys)
+    # Longitude 180 and latitude 90 fall in the last cell, not a cell past the grid
+    assert _key(180, 0) == _key(180 - STEP / 2, STEP / 2)
+    assert _key(0, 90) == _key(STEP / 2, 90 - STEP / 2)
+
+def test_bbox_locks_every_touched_cell_in_sorted_order():
+    cells = plot_lock_cells((39.2001, -6.8001, 39.2001 + 2 * STEP, -6.7999))
+    assert len(cells) == 6
+    assert cells == sorted(cells)
+
+def test_large_bbox_falls_back_to_the_namespace_lock():
+    assert plot_lock_cells((30, -10, 30 + STEP * PLOT_LOCK_MAX_CELLS, -10)) is None
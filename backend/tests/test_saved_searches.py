@@ -0,0 +1,68 @@
+"""Unit tests for saved-search matching."""
+from decimal import Decimal
+
+from app.core.saved_searches import SavedSearchIndex, became_available, matches_plot
+from app.db.models import PlotStatus
+from app.schemas.plot import PlotSearch
+
+PLOT = {
+    "status": PlotStatus.AVAILABLE,
+    "usage_type": "Residential",
+    "council_id": 7,
+    "district_id": 3,
+    "region_id": 1,
+    "price": Decimal("50000000"),
+    "area_sqm": Decimal("800"),
+    "title": "Beach plot",
+    "description": "Close to the ocean",
+}
+
+def _index(*searches):
+    index = SavedSearchIndex()
+    index.load((search_id, f"user-{search_id}", criteria) for search_id, criteria in searches)
+    return index
+
+def test_matches_plot_checks_every_filter():
+    assert matches_plot(PlotSearch(), PLOT)
+    assert matches_plot(PlotSearch(search="OCEAN", min_area=Decimal("500"), max_price=Decimal("60000000")), PLOT)
+    assert not matches_plot(PlotSearch(district_id=4), PLOT)
+    assert not matches_plot(PlotSearch(max_area=Decimal("500")), PLOT)
+    assert not matches_plot(PlotSearch(search="hillside"), PLOT)
+    assert not matches_plot(PlotSearch(min_price=Decimal("1")), {**PLOT, "price": None})
+
+def test_match_uses_location_usage_and_price_buckets():
+    index = _index(
+        ("anywhere", PlotSearch()),
+        ("council", PlotSearch(council_id=7)),
+        ("region-residential", PlotSearch(region_id=1, usage_type="Residential")),
+        ("other-region", PlotSearch(region_id=2)),
+        ("commercial", PlotSearch(usage_type="Commercial")),
+        ("affordable", PlotSearch(min_price=Decimal("10000000"))),
+        ("too-expensive", PlotSearch(min_price=Decimal("90000000"))),
+        ("too-cheap", PlotSearch(max_price=Decimal("10000000"))),
+    )
+    matched = dict(index.match(PLOT))
+    assert set(matched) == {"anywhere", "council", "region-residential", "affordable"}
+    assert matched["council"] == "user-council"
+
+def test_plot_without_price_only_matches_searches_without_minimum():
+    index = _index(("anywhere", PlotSearch()), ("priced", PlotSearch(min_price=Decimal("1"))))
+    assert index.match({**PLOT, "price": None}) == [("anywhere", "user-anywhere")]
+
+def test_add_replaces_and_remove_deletes():
+    index = _index(("s1", PlotSearch(region_id=2)))
+    assert index.match(PLOT) == []
+    index.add("s1", "user-s1", PlotSearch(region_id=1))
+    assert index.match(PLOT) == [("s1", "user-s1")]
+    index.remove("s1")
+    index.remove("s1")
+    assert index.match(PLOT) == []
+    assert len(index) == 0
+
+def test_became_available():
+    sold = {**PLOT, "status": PlotStatus.SOLD}
+    assert became_available(None, PLOT)
+    assert became_available(sold, PLOT)
+    assert not became_available(PLOT, PLOT)
+    assert not became_available(PLOT, sold)
+    assert not became_available(PLOT, None)
@@ -0,0 +1,159 @@
+"""Query-plan regression tests for plot search and the plot feeds.
+
+Every combination of the filters ``search_plots`` supports, and the latest
+and featured feed queries, are EXPLAINed against a seeded PostGIS database.
+A case fails if its plan reads ``plots`` with a sequential scan or its
+estimated cost exceeds ``PLAN_COST_BUDGET``.
+
+``plan_baselines.json`` records, per case, only the indexes the plan reads
+``plots`` through. Join strategies and node types vary between PostgreSQL
+versions and are not compared. A changed index set is reported as a
+warning; with ``STRICT_PLAN_BASELINES=1`` a changed or missing baseline
+fails the case.
+
+    PLAN_TEST_DATABASE_URL=postgresql://localhost/plans_scratch python -m pytest tests/test_search_plans.py
+    STRICT_PLAN_BASELINES=1 PLAN_TEST_DATABASE_URL=... python -m pytest tests/test_search_plans.py
+    UPDATE_PLAN_BASELINES=1 PLAN_TEST_DATABASE_URL=... python -m pytest tests/test_search_plans.py
+"""
+import itertools
+import os
+import warnings
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.crud.crud_plot import PLOT_SORTS, build_featured_query, build_latest_query, build_search_query
+from app.db.models import PlotStatus
+from app.schemas.plot import PlotSearch
+
+PLAN_COST_BUDGET = float(os.getenv("PLAN_COST_BUDGET", "25000"))
+STRICT_PLAN_BASELINES = os.getenv("STRICT_PLAN_BASELINES") == "1"
+UPDATE_PLAN_BASELINES = os.getenv("UPDATE_PLAN_BASELINES") == "1"
+
+# Page size used by the plots list endpoint
+PAGE_SIZE = 100
+
+LOCATIONS = {
+    "anywhere": {},
+    "council": {"council_id": 17},
+    "district": {"district_id": 5},
+    "region": {"region_id": 3},
+}
+PRICES = {
+    "any-price": {},
+    "min-price": {"min_price": Decimal("500000000")},
+    "max-price": {"max_price": Decimal("20000000")},
+    "price-range": {"min_price": Decimal("50000000"), "max_price": Decimal("100000000")},
+}
+AREAS = {
+    "any-area": {},
+    "area-range": {"min_area": Decimal("500"), "max_area": Decimal("1500")},
+}
+USAGE_TYPES = {
+    "any-usage": {},
+    "commercial": {"usage_type": "Commercial"},
+}
+STATUSES = {
+    "available": {"status": PlotStatus.AVAILABLE},
+    "sold": {"status": PlotStatus.SOLD},
+    "any-status": {"status": None},
+}
+TEXT_SEARCHES = {
+    "no-text": {},
+    "text": {"search": "beach"},
+    # Matches almost nothing, like most searches for a name or plot number
+    "rare-text": {"search": "c0ffee"},
+}
+
+# Feeds load twice the page size (see FeedStore.keep)
+FEED_QUERIES = {
+    "feed-latest": lambda session: build_latest_query(session, settings.FEED_SIZE * 2),
+    "feed-featured": lambda session: build_featured_query(session, settings.FEED_SIZE * 2),
+}
+
+def _cases():
+    dimensions = [LOCATIONS, PRICES, AREAS, USAGE_TYPES, STATUSES, TEXT_SEARCHES]
+    for combination in itertools.product(*(dimension.items() for dimension in dimensions)):
+        filters = {}
+        for _, values in combination:
+            filters.update(values)
+        for sort in PLOT_SORTS:
+            case_id = "-".join(name for name, _ in combination) + f"-{sort}"
+            yield pytest.param(PlotSearch(**filters, sort=sort), id=case_id)
+
+def search_query(session, search_params: PlotSearch):
+    """The query search_plots runs for one page of results."""
+    return build_search_query(session, search_params).offset(0).limit(PAGE_SIZE)
+
+def explain(session, query) -> dict:
+    # Rendered with literal values (and a paramstyle that leaves "%" alone) so
+    # the SQL can be run after EXPLAIN; "%" is then escaped for the driver.
+    dialect = postgresql.dialect(paramstyle="named")
+    sql = str(query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    statement = f"EXPLAIN (FORMAT JSON) {sql}".replace("%", "%%")
+    return session.connection().exec_driver_sql(statement).scalar()[0]["Plan"]
+
+def iter_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_nodes(child)
+
+def plan_shape(plan: dict, depth: int = 0) -> list:
+    """Readable plan tree without costs or row estimates, one node per line."""
+    label = plan["Node Type"]
+    if plan.get("Index Name"):
+        label += f" using {plan['Index Name']}"
+    if plan.get("Relation Name"):
+        label += f" on {plan['Relation Name']}"
+    lines = ["  " * depth + ("-> " if depth else "") + label]
+    for child in plan.get("Plans", []):
+        lines.extend(plan_shape(child, depth + 1))
+    return lines
+
+def plot_indexes(plan: dict, relation: str = None) -> list:
+    """Sorted names of the indexes the plan reads ``plots`` through."""
+    # Bitmap index scans carry no relation; it is on their Bitmap Heap Scan parent.
+    relation = plan.get("Relation Name", relation)
+    names = set()
+    if plan.get("Index Name") and relation == "plots":
+        names.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        names.update(plot_indexes(child, relation))
+    return sorted(names)
+
+def check_plan(case_id: str, plan: dict, plan_baselines) -> None:
+    baselines, current = plan_baselines
+    indexes = plot_indexes(plan)
+    current[case_id] = indexes
+
+    report = "\n".join(plan_shape(plan))
+    strict = STRICT_PLAN_BASELINES and not UPDATE_PLAN_BASELINES
+    baseline = baselines.get(case_id)
+    if baseline is not None and baseline != indexes:
+        message = f"Indexes on plots changed for {case_id}: {baseline} -> {indexes}\n{report}"
+        if strict:
+            pytest.fail(message)
+        warnings.warn(message)
+    elif baseline is None and strict:
+        pytest.fail(f"No baseline for {case_id}; record one with UPDATE_PLAN_BASELINES=1:\n{report}")
+
+    seq_scans = [
+        node for node in iter_nodes(plan)
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") == "plots"
+    ]
+    assert not seq_scans, f"Sequential scan on plots:\n{report}"
+
+    cost = plan["Total Cost"]
+    assert cost <= PLAN_COST_BUDGET, f"Estimated cost {cost} exceeds budget {PLAN_COST_BUDGET}:\n{report}"
+
+@pytest.mark.parametrize("search_params", list(_cases()))
+def test_search_plan(request, plan_session, plan_baselines, search_params):
+    plan = explain(plan_session, search_query(plan_session, search_params))
+    check_plan(request.node.callspec.id, plan, plan_baselines)
+
+@pytest.mark.parametrize("case_id", list(FEED_QUERIES))
+def test_feed_plan(plan_session, plan_baselines, case_id):
+    plan = explain(plan_session, FEED_QUERIES[case_id](plan_session))
+    check_plan(case_id, plan, plan_baselines)
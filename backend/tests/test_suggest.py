@@ -0,0 +1,55 @@
+"""Unit tests for the typeahead prefix indexes."""
+from app.core.suggest import MAX_SCAN, PrefixIndex, Suggestion, SuggestIndex, normalize
+
+def _ids(suggestions):
+    return [suggestion.id for suggestion in suggestions]
+
+def test_normalize_folds_case_accents_and_spaces():
+    assert normalize("  Dar  es   SALAAM ") == "dar es salaam"
+    assert normalize("Kigoma-Ujiji Ümbo") == "kigoma-ujiji umbo"
+
+def test_search_matches_any_word_suffix():
+    index = PrefixIndex()
+    index.load([
+        Suggestion("region", "1", "Dar es Salaam"),
+        Suggestion("region", "2", "Dodoma"),
+    ])
+    assert _ids(index.search("es sal")) == ["1"]
+    assert _ids(index.search("SALA")) == ["1"]
+    assert _ids(index.search("d")) == ["2", "1"]
+    assert index.search("  ") == []
+
+def test_search_ranks_exact_then_prefix_then_kind():
+    index = PrefixIndex()
+    index.load([
+        Suggestion("council", "c", "Arusha"),
+        Suggestion("region", "r", "Arusha"),
+        Suggestion("district", "d", "Arusha Rural"),
+        Suggestion("council", "m", "Meru Arusha"),
+    ])
+    assert _ids(index.search("arusha")) == ["r", "c", "d", "m"]
+    assert _ids(index.search("arusha", limit=2)) == ["r", "c"]
+
+def test_add_replaces_and_remove_deletes():
+    index = PrefixIndex()
+    index.add(Suggestion("plot", "p1", "PLT-001"))
+    index.add(Suggestion("plot", "p1", "PLT-777"))
+    assert index.search("plt-001") == []
+    assert _ids(index.search("plt-7")) == ["p1"]
+    index.remove("plot", "p1")
+    index.remove("plot", "p1")
+    assert index.search("plt") == []
+    assert len(index) == 0
+
+def test_plots_do_not_crowd_out_locations():
+    index = SuggestIndex()
+    index.locations.load([Suggestion("region", "r", "Pwani")])
+    index.plots.load(Suggestion("plot", str(number), f"P-{number:05d}") for number in range(MAX_SCAN * 2))
+    assert index.search("p", limit=3)[0].id == "r"
+
+def test_set_plot_adds_and_removes_plot_numbers():
+    index = SuggestIndex()
+    index.set_plot("p1", "PLT-42", "Beach plot")
+    assert index.search("plt-42") == [Suggestion("plot", "p1", "PLT-42", "Beach plot")]
+    index.set_plot("p1", None)
+    assert index.search("plt-42") == []
@@ -1,4 +1,5 @@
-import { Plot, User, Order } from '../types';
+import { Plot, PlotPoints, User, Order } from '../types';
+import { decodeColumnPlots, decodePackedPlots } from '../utils/mapPayload';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api';
 
@@ -78,6 +79,31 @@ class ApiService {
     return response.json();
   }
 
+  // Id, centroid, price and status only, for plotting thousands of plots on the map
+  async getPlotPoints(params?: any, format: 'columns' | 'packed' = 'packed'): Promise<PlotPoints> {
+    const searchParams = new URLSearchParams();
+    
+    if (params) {
+      Object.keys(params).forEach(key => {
+        if (params[key] !== null && params[key] !== undefined && params[key] !== '') {
+          searchParams.append(key, params[key].toString());
+        }
+      });
+    }
+    searchParams.set('format', format);
+
+    const response = await fetch(`${API_BASE_URL}/plots?${searchParams}`);
+
+    if (!response.ok) {
+      throw new Error('Failed to fetch plot points');
+    }
+
+    if (format === 'packed') {
+      return decodePackedPlots(await response.arrayBuffer());
+    }
+    return decodeColumnPlots(await response.json());
+  }
+
   async getPlot(id: string): Promise<Plot> {
     const response = await fetch(`${API_BASE_URL}/plots/${id}`);
 
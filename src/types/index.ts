@@ -78,4 +78,26 @@ export interface Language {
   code: 'en' | 'sw';
   name: string;
   nativeName: string;
-}
\ No newline at end of file
+}
+
+// Body of GET /plots?format=columns; lon and lat are null where the centroid is unknown.
+export interface PlotColumnsPayload {
+  count: number;
+  statuses: Plot['status'][];
+  id: string[];
+  lon: (number | null)[];
+  lat: (number | null)[];
+  price: number[];
+  status: number[];
+}
+
+// Compact plot list for maps (GET /plots?format=columns|packed), one array per field.
+export interface PlotPoints {
+  count: number;
+  ids: string[];
+  lon: Float32Array | Float64Array;
+  lat: Float32Array | Float64Array;
+  price: Float64Array;
+  status: Uint8Array;
+  statuses: Plot['status'][];
+}
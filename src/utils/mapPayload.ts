@@ -0,0 +1,63 @@
+import { Plot, PlotColumnsPayload, PlotPoints } from '../types';
+
+// Matches app.core.map_payload on the backend.
+const PACKED_MAGIC = 'PMP1';
+const PACKED_HEADER_BYTES = 8;
+const UUID_BYTES = 16;
+
+// Status order of the backend PlotStatus enum; packed payloads do not carry it.
+export const PLOT_STATUS_CODES: Plot['status'][] = ['available', 'locked', 'pending_payment', 'sold'];
+
+const HEX = Array.from({ length: 256 }, (_, byte) => byte.toString(16).padStart(2, '0'));
+
+const formatUuid = (bytes: Uint8Array, offset: number): string => {
+  let hex = '';
+  for (let i = 0; i < UUID_BYTES; i++) {
+    if (i === 4 || i === 6 || i === 8 || i === 10) hex += '-';
+    hex += HEX[bytes[offset + i]];
+  }
+  return hex;
+};
+
+export const decodePackedPlots = (buffer: ArrayBuffer): PlotPoints => {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+  if (magic !== PACKED_MAGIC) {
+    throw new Error('Unrecognized plot payload');
+  }
+  const count = view.getUint32(4, true);
+
+  // Typed arrays use the platform byte order; every browser we support is little-endian.
+  let offset = PACKED_HEADER_BYTES;
+  const price = new Float64Array(buffer, offset, count);
+  offset += count * 8;
+  const lon = new Float32Array(buffer, offset, count);
+  offset += count * 4;
+  const lat = new Float32Array(buffer, offset, count);
+  offset += count * 4;
+  const idBytes = new Uint8Array(buffer, offset, count * UUID_BYTES);
+  offset += count * UUID_BYTES;
+  const status = new Uint8Array(buffer, offset, count);
+
+  const ids = new Array<string>(count);
+  for (let i = 0; i < count; i++) {
+    ids[i] = formatUuid(idBytes, i * UUID_BYTES);
+  }
+
+  return { count, ids, lon, lat, price, status, statuses: PLOT_STATUS_CODES };
+};
+
+export const decodeColumnPlots = (payload: PlotColumnsPayload): PlotPoints => ({
+  count: payload.count,
+  ids: payload.id,
+  // Unknown centroids are null in JSON and become NaN, as in the packed format.
+  lon: Float64Array.from(payload.lon, (value) => value ?? NaN),
+  lat: Float64Array.from(payload.lat, (value) => value ?? NaN),
+  price: Float64Array.from(payload.price),
+  status: Uint8Array.from(payload.status),
+  statuses: payload.statuses,
+});
+
+export const plotPointStatus = (points: PlotPoints, index: number): Plot['status'] => {
+  return points.statuses[points.status[index]];
+};